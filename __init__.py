@@ -1,2 +1,4 @@
 from websites.gamefaqs.model import GameFAQs
 from websites.gamerankings.model import Gamerankings
+from websites.gamefaqs.asyncmodel import AsyncGameFAQs
+from websites.gamerankings.asyncmodel import AsyncGamerankings
\ No newline at end of file
@@ -0,0 +1,77 @@
+'''
+This module checks that all parsing functions of both websites return identical results with every installed
+BeautifulSoup backend, on the saved fixture pages of the parsers benchmark.
+
+Every case is parsed once from the full page and, if the website model restricts it to a region, once from
+that region only. The results of all backends are compared to those of html.parser, which is always installed.
+
+Usage: python -m benchmarks.parity [--parsers lxml ...]
+'''
+
+import argparse
+import os
+import sys
+from helper import helper
+from benchmarks.parsers import CASES, FIXTURES, get_name, get_parsers
+
+
+def get_result(markup, func, parser, region):
+    '''
+    Returns the result of a parsing function on a fixture page, or the type of the exception it raised,
+    e.g. StopIteration on an empty search page.
+
+    :param markup: Markup of the fixture page.
+    :param func: Parsing function.
+    :param parser: BeautifulSoup backend.
+    :param region: Region of the page to be parsed. If None, the full page is parsed.
+    '''
+    try:
+        return func(helper.get_document(markup, parser, region))
+    except Exception as error:
+        return type(error)
+
+
+def run(parsers=None):
+    '''
+    Runs all cases for all backends and prints the cases, whose results differ. Returns the number of differences.
+
+    :param parsers: BeautifulSoup backends compared to html.parser. Defaults to all installed backends.
+    '''
+    parsers = [parser for parser in (parsers if parsers else get_parsers()) if parser != 'html.parser']
+    differences = 0
+    checks = 0
+
+    for fixture, func, region in CASES:
+        with open(os.path.join(FIXTURES, fixture), encoding='utf-8') as file:
+            markup = file.read()
+
+        for scope in dict.fromkeys([None, region]):
+            expected = get_result(markup, func, 'html.parser', scope)
+
+            for parser in parsers:
+                checks += 1
+                if get_result(markup, func, parser, scope) != expected:
+                    differences += 1
+                    print(f'{get_name(fixture, func)} ({"full page" if scope is None else "region"}): '
+                          f'{parser} differs from html.parser')
+
+    print(f'{checks} checks of {", ".join(parsers) if parsers else "no backend"} against html.parser, '
+          f'{differences} differences')
+    return differences
+
+
+def main(argv=None):
+    '''
+    Runs the parity check from the command line. Exits with status 1, if any results differ.
+
+    :param argv: Command line arguments, defaults to sys.argv.
+    '''
+    arguments = argparse.ArgumentParser(description='Checks that all backends return identical results.')
+    arguments.add_argument('--parsers', nargs='+', choices=helper.PARSERS, help='backends, defaults to all installed')
+    arguments = arguments.parse_args(argv)
+
+    return 1 if run(arguments.parsers) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+'''
+This module benchmarks all parsing functions of both websites on the saved fixture pages, without any
+network access.
+
+Every case parses a fixture page with a BeautifulSoup backend, restricted to the region the website model
+uses for the function, and executes the function on the resulting document. For every case and backend,
+the operations per second, the 50th, 95th and 99th latency percentiles and the peak memory of a single call
+are reported. The fixture corpus contains small, typical and huge pages of every page type.
+
+The results can be stored as JSON file and compared to the results of another commit. Cases, which got
+slower than the tolerated ratio, are reported as regressions, making the command exit with status 1.
+
+Usage: python -m benchmarks.parsers [--parsers lxml ...] [--seconds 0.5] [--filter versions]
+       [--save results.json] [--compare baseline.json] [--tolerance 1.1]
+'''
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import bs4
+from helper import helper
+from websites.decorators import Parameters
+from websites.gamefaqs import gameparser, gamesearcher as gamefaqs_searcher
+from websites.gamerankings import gamesearcher as gamerankings_searcher, reviewparser
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+CASES = [
+    ('gamefaqs/base.html', gameparser.get_name, Parameters.Regions.NAME),
+    ('gamefaqs/base.html', gameparser.get_description, Parameters.Regions.DESCRIPTION),
+    ('gamefaqs/base.html', gameparser.get_user_ratings, Parameters.Regions.USER_RATINGS),
+    ('gamefaqs/base.html', gameparser.get_base_info, Parameters.Regions.BASE_INFO),
+    ('gamefaqs/base.html', gameparser.get_full_base_info, None),
+    ('gamefaqs/data_small.html', gameparser.get_advanced_info, None),
+    ('gamefaqs/data.html', gameparser.get_advanced_info, None),
+    ('gamefaqs/data_huge.html', gameparser.get_advanced_info, None),
+    ('gamefaqs/data.html', gameparser.get_title_data, Parameters.Regions.TITLE_DATA),
+    ('gamefaqs/data_small.html', gameparser.get_versions, Parameters.Regions.VERSIONS),
+    ('gamefaqs/data.html', gameparser.get_versions, Parameters.Regions.VERSIONS),
+    ('gamefaqs/data_huge.html', gameparser.get_versions, Parameters.Regions.VERSIONS),
+    ('gamefaqs/data.html', gameparser.get_dlc, Parameters.Regions.DLC),
+    ('gamefaqs/data_huge.html', gameparser.get_dlc, Parameters.Regions.DLC),
+    ('gamefaqs/questions_small.html', gameparser.get_questions, Parameters.Regions.QUESTIONS),
+    ('gamefaqs/questions_answered.html', gameparser.get_questions, Parameters.Regions.QUESTIONS),
+    ('gamefaqs/questions_huge.html', gameparser.get_questions, Parameters.Regions.QUESTIONS),
+    ('gamefaqs/answer_details.html', gameparser.get_question_details, Parameters.Regions.QUESTION_DETAILS),
+    ('gamefaqs/answer_details_huge.html', gameparser.get_question_details, Parameters.Regions.QUESTION_DETAILS),
+    ('gamefaqs/all_games.html', gameparser.get_all_games, Parameters.Regions.ALL_GAMES),
+    ('gamefaqs/search.html', gamefaqs_searcher.parse_search_results, None),
+    ('gamefaqs/search_empty.html', gamefaqs_searcher.parse_search_results, None),
+    ('gamerankings/search.html', gamerankings_searcher.parse_search_results, None),
+    ('gamerankings/reviews_small.html', reviewparser.get_rankings, Parameters.Regions.REVIEWS),
+    ('gamerankings/reviews.html', reviewparser.get_rankings, Parameters.Regions.REVIEWS),
+    ('gamerankings/reviews_huge.html', reviewparser.get_rankings, Parameters.Regions.REVIEWS)]
+
+
+def get_name(fixture, func):
+    '''
+    Returns the name of a case, e.g. gamefaqs.gameparser.get_versions[data_huge].
+
+    :param fixture: Path of the fixture page relative to the fixtures directory.
+    :param func: Parsing function.
+    '''
+    module = func.__module__.replace('websites.', '')
+    page = os.path.splitext(os.path.basename(fixture))[0]
+    return f'{module}.{func.__name__}[{page}]'
+
+
+def get_parsers():
+    '''
+    Returns all BeautifulSoup backends supported by the helper module, which are installed.
+    '''
+    parsers = list()
+
+    for parser in helper.PARSERS:
+        try:
+            bs4.BeautifulSoup('', parser)
+        except bs4.FeatureNotFound:
+            continue
+        parsers.append(parser)
+
+    return parsers
+
+
+def call(markup, func, parser, region):
+    '''
+    Parses the markup and executes the parsing function on it. The end of a search is not an error.
+    '''
+    try:
+        func(helper.get_document(markup, parser, region))
+    except StopIteration:
+        pass
+
+
+def measure(markup, func, parser, region, seconds):
+    '''
+    Returns the operations per second, the latency percentiles in milliseconds and the peak memory in kilobytes
+    of parsing the markup and executing the parsing function on it.
+
+    :param markup: Markup of the fixture page.
+    :param func: Parsing function.
+    :param parser: BeautifulSoup backend.
+    :param region: Region to be parsed. If None, the full page is parsed.
+    :param seconds: Minimum time spent on the timed calls. At least 5 calls are timed.
+    '''
+    call(markup, func, parser, region)
+
+    latencies = list()
+    start = time.perf_counter()
+    while len(latencies) < 5 or time.perf_counter() - start < seconds:
+        call_start = time.perf_counter()
+        call(markup, func, parser, region)
+        latencies.append(time.perf_counter() - call_start)
+
+    tracemalloc.start()
+    call(markup, func, parser, region)
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        'Ops/s': len(latencies) / sum(latencies),
+        'P50': percentile(0.5),
+        'P95': percentile(0.95),
+        'P99': percentile(0.99),
+        'Peak-KiB': peak,
+        'Calls': len(latencies)}
+
+
+def run(parsers=None, seconds=0.5, filter=None):
+    '''
+    Runs all cases for all backends, prints a result table and returns the results with the environment.
+
+    :param parsers: BeautifulSoup backends to be benchmarked. Defaults to all installed backends.
+    :param seconds: Minimum time spent per case and backend.
+    :param filter: Only cases, whose name contains this string, are run.
+    '''
+    parsers = parsers if parsers else get_parsers()
+    results = dict()
+    markups = dict()
+
+    print(f'{"case":<64}{"parser":<12}{"ops/s":>10}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"peak KiB":>10}')
+
+    for fixture, func, region in CASES:
+        name = get_name(fixture, func)
+        if filter and filter not in name:
+            continue
+
+        if fixture not in markups:
+            with open(os.path.join(FIXTURES, fixture), encoding='utf-8') as file:
+                markups[fixture] = file.read()
+
+        for parser in parsers:
+            result = measure(markups[fixture], func, parser, region, seconds)
+            results[f'{name}:{parser}'] = result
+            print(f'{name:<64}{parser:<12}{result["Ops/s"]:>10.1f}{result["P50"]:>9.2f}{result["P95"]:>9.2f}'
+                  f'{result["P99"]:>9.2f}{result["Peak-KiB"]:>10.0f}')
+
+    return {
+        'Commit': get_commit(),
+        'Time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'Python': platform.python_version(),
+        'BeautifulSoup': bs4.__version__,
+        'Results': results}
+
+
+def compare(results, baseline, tolerance=1.1):
+    '''
+    Prints the change of the median latency of every case compared to a baseline and returns the names
+    of all cases, whose median latency grew by more than the tolerated ratio.
+
+    :param results: Results returned by run.
+    :param baseline: Results of an earlier run, e.g. loaded from a file stored by save.
+    :param tolerance: Tolerated ratio of the current to the baseline median latency.
+    '''
+    regressions = list()
+
+    print(f'\nCompared to {baseline.get("Commit") or "baseline"}:')
+    for name, result in results['Results'].items():
+        if name not in baseline['Results']:
+            continue
+
+        ratio = result['P50'] / baseline['Results'][name]['P50']
+        regressed = ratio > tolerance
+        if regressed:
+            regressions.append(name)
+        print(f'{name:<76}{ratio:>8.2f}x{"  REGRESSION" if regressed else ""}')
+
+    return regressions
+
+
+def save(results, path):
+    '''
+    Stores the results as JSON file.
+
+    :param results: Results returned by run.
+    :param path: Path of the JSON file.
+    '''
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+
+
+def get_commit():
+    '''
+    Returns the hash of the checked out commit, or None if it cannot be determined.
+    '''
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(__file__),
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    '''
+    Runs the benchmark from the command line. Returns 1 if a regression was found, else 0.
+
+    :param argv: Command line arguments, defaults to sys.argv.
+    '''
+    arguments = argparse.ArgumentParser(description='Benchmarks the parsing functions on the fixture pages.')
+    arguments.add_argument('--parsers', nargs='+', choices=helper.PARSERS, help='backends, defaults to all installed')
+    arguments.add_argument('--seconds', type=float, default=0.5, help='minimum time per case and backend')
+    arguments.add_argument('--filter', help='only run cases whose name contains this string')
+    arguments.add_argument('--save', help='store the results in this JSON file')
+    arguments.add_argument('--compare', help='compare the results to this JSON file')
+    arguments.add_argument('--tolerance', type=float, default=1.1, help='tolerated ratio of median latencies')
+    arguments = arguments.parse_args(argv)
+
+    results = run(arguments.parsers, arguments.seconds, arguments.filter)
+
+    if arguments.save:
+        save(results, arguments.save)
+
+    if arguments.compare:
+        with open(arguments.compare, encoding='utf-8') as file:
+            if compare(results, json.load(file), arguments.tolerance):
+                return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
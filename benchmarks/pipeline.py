@@ -0,0 +1,105 @@
+'''
+This module benchmarks the throughput of parsing the info pages of games by worker threads against
+parse worker processes, as done by the crawler with and without parse_workers.
+
+The bodies of the fixture pages of a game (base, advanced and answered questions page) are sent to
+the parse workers as many times as games are requested, so no network is involved. Threads are limited
+by the GIL to about one core, while the throughput of processes should grow with the number of cores.
+
+Usage: python -m benchmarks.pipeline [--workers 1 2 4] [--games 200] [--parser lxml]
+'''
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from helper import helper
+from websites.gamefaqs import crawler
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'gamefaqs')
+
+PAGES = {
+    'base': 'base.html',
+    'advanced': 'data.html',
+    'questions_answered': 'questions_answered.html',
+    'questions_unresolved': 'questions_answered.html'}
+
+
+def get_pages():
+    '''
+    Returns the fixture pages of a game in the format passed to the parse workers.
+    '''
+    pages = dict()
+
+    for page, fixture in PAGES.items():
+        with open(os.path.join(FIXTURES, fixture), 'rb') as file:
+            pages[page] = (file.read(), 'utf-8')
+
+    return pages
+
+
+def measure(executor_type, workers, pages, parser, games):
+    '''
+    Returns the number of games parsed per second by the given number of workers.
+
+    :param executor_type: ThreadPoolExecutor or ProcessPoolExecutor.
+    :param workers: Number of workers.
+    :param pages: Fixture pages of a game.
+    :param parser: BeautifulSoup backend.
+    :param games: Number of parsed games.
+    '''
+    with executor_type(max_workers=workers) as executor:
+        list(executor.map(crawler.parse_pages, [pages] * workers, [parser] * workers))
+
+        start = time.perf_counter()
+        futures = [executor.submit(crawler.parse_pages, pages, parser) for _ in range(games)]
+        for future in futures:
+            future.result()
+
+        return games / (time.perf_counter() - start)
+
+
+def run(workers=None, games=200, parser=None):
+    '''
+    Runs the benchmark for all numbers of workers and prints a comparison table.
+
+    :param workers: Numbers of workers. Defaults to 1, 2, 4, ... up to the number of cores.
+    :param games: Number of parsed games per measurement.
+    :param parser: BeautifulSoup backend, defaults to the process-wide default.
+    '''
+    parser = parser if parser else helper.default_parser
+    cores = os.cpu_count() or 1
+    workers = workers if workers else sorted(set([2 ** exponent for exponent in range(cores.bit_length())] + [cores]))
+    pages = get_pages()
+    baseline = None
+
+    print(f'{cores} cores, parser {parser}')
+    print(f'{"workers":<9}{"threads games/s":>16}{"processes games/s":>19}{"scaling":>9}')
+
+    for count in workers:
+        threads = measure(ThreadPoolExecutor, count, pages, parser, games)
+        processes = measure(ProcessPoolExecutor, count, pages, parser, games)
+        baseline = baseline if baseline else processes / count
+
+        print(f'{count:<9}{threads:>16.1f}{processes:>19.1f}{processes / baseline:>8.1f}x')
+
+
+def main(argv=None):
+    '''
+    Runs the benchmark from the command line.
+
+    :param argv: Command line arguments, defaults to sys.argv.
+    '''
+    arguments = argparse.ArgumentParser(description='Benchmarks parse worker threads against processes.')
+    arguments.add_argument('--workers', nargs='+', type=int, help='numbers of workers, defaults to powers of two')
+    arguments.add_argument('--games', type=int, default=200, help='parsed games per measurement')
+    arguments.add_argument('--parser', choices=helper.PARSERS, help='backend, defaults to the process-wide default')
+    arguments = arguments.parse_args(argv)
+
+    run(arguments.workers, arguments.games, arguments.parser)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+'''
+This module benchmarks the memory retained by the results of the parsing functions as dictionaries
+against the compact records of the records module.
+
+Every fixture page is parsed once, afterwards its result is copied as many times as needed to simulate
+a full catalog. The memory held by all copies is measured by tracemalloc, once for the dictionaries and once
+for the records created from them.
+
+Usage: python -m benchmarks.records [copies]
+'''
+
+import copy
+import os
+import sys
+import tracemalloc
+from helper import helper
+from websites import records
+from websites.gamefaqs import gameparser
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'gamefaqs')
+
+CASES = [
+    ('all_games.html', gameparser.get_all_games),
+    ('data.html', gameparser.get_versions),
+    ('data.html', gameparser.get_dlc),
+    ('questions_answered.html', gameparser.get_questions),
+    ('answer_details.html', gameparser.get_question_details)]
+
+
+def measure(create, copies):
+    '''
+    Returns the memory in kilobytes retained by the given number of results created by the given function.
+
+    :param create: Function returning a single result.
+    :param copies: Number of results to be kept.
+    '''
+    tracemalloc.start()
+    results = [create() for _ in range(copies)]
+    size = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+    del results
+
+    return size
+
+
+def run(copies=100):
+    '''
+    Runs all cases and prints a comparison table.
+
+    :param copies: Number of copies of every result kept in memory.
+    '''
+    print(f'{"function":<24}{"dict KiB":>11}{"record KiB":>12}{"saving":>9}')
+
+    for fixture, func in CASES:
+        with open(os.path.join(FIXTURES, fixture), encoding='utf-8') as file:
+            result = func(helper.get_document(file.read()))
+
+        dict_size = measure(lambda: copy.deepcopy(result), copies)
+        record_size = measure(lambda: records.from_result(func, copy.deepcopy(result)), copies)
+
+        print(f'{func.__name__:<24}{dict_size:>11.0f}{record_size:>12.0f}{1 - record_size / dict_size:>8.0%}')
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:]])
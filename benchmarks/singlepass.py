@@ -0,0 +1,113 @@
+'''
+This module benchmarks the single-pass extraction of the full base and advanced info against the previous
+multi-pass approach, which calls every single parsing function on the page, each of them searching the
+whole document again.
+
+Every fixture page is parsed once per BeautifulSoup backend, afterwards only the extraction is timed,
+as the document build is the same for both approaches. Before timing, both results are checked to be identical.
+
+Usage: python -m benchmarks.singlepass [--parsers lxml ...] [--repeat 200]
+'''
+
+import argparse
+import os
+import sys
+import time
+from helper import helper
+from benchmarks.parsers import get_parsers
+from websites.gamefaqs import gameparser
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'gamefaqs')
+
+
+def get_full_base_info(base_info_page):
+    '''
+    Returns the full base info by calling all operations on the base info page one after another.
+    '''
+    result = gameparser.get_base_info(base_info_page)
+    result['Description'] = gameparser.get_description(base_info_page)
+    result['User-Ratings'] = gameparser.get_user_ratings(base_info_page)
+    result['Name'] = gameparser.get_name(base_info_page)
+
+    return result
+
+
+def get_advanced_info(advanced_info_page):
+    '''
+    Returns the full advanced info by calling all operations on the advanced info page one after another.
+    '''
+    result = dict()
+
+    result['Title-Data'] = gameparser.get_title_data(advanced_info_page)
+    result['Versions'] = gameparser.get_versions(advanced_info_page)
+    result['DLC'] = gameparser.get_dlc(advanced_info_page)
+
+    return result
+
+
+CASES = [
+    ('base.html', get_full_base_info, gameparser.get_full_base_info),
+    ('data_small.html', get_advanced_info, gameparser.get_advanced_info),
+    ('data.html', get_advanced_info, gameparser.get_advanced_info),
+    ('data_huge.html', get_advanced_info, gameparser.get_advanced_info)]
+
+
+def measure(func, document, repeat):
+    '''
+    Returns the mean time in milliseconds of executing the parsing function on the document.
+
+    :param func: Parsing function.
+    :param document: BeautifulSoup object of the fixture page.
+    :param repeat: Number of timed calls.
+    '''
+    func(document)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(document)
+
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(parsers=None, repeat=200):
+    '''
+    Runs all cases for all backends and prints a comparison table.
+
+    :param parsers: BeautifulSoup backends. Defaults to all installed backends.
+    :param repeat: Number of timed calls per case, approach and backend.
+
+    :raise AssertionError: If the results of both approaches differ, an AssertionError will be raised.
+    '''
+    print(f'{"page":<18}{"parser":<14}{"multi ms":>10}{"single ms":>11}{"speedup":>9}')
+
+    for fixture, multi_pass, single_pass in CASES:
+        with open(os.path.join(FIXTURES, fixture), encoding='utf-8') as file:
+            markup = file.read()
+
+        for parser in parsers if parsers else get_parsers():
+            document = helper.get_document(markup, parser)
+            assert multi_pass(document) == single_pass(document), f'Results differ for {fixture} ({parser}).'
+
+            multi_time = measure(multi_pass, document, repeat)
+            single_time = measure(single_pass, document, repeat)
+
+            print(f'{fixture:<18}{parser:<14}{multi_time:>10.3f}{single_time:>11.3f}{multi_time / single_time:>8.1f}x')
+
+
+def main(argv=None):
+    '''
+    Runs the benchmark from the command line.
+
+    :param argv: Command line arguments, defaults to sys.argv.
+    '''
+    arguments = argparse.ArgumentParser(description='Benchmarks single-pass against multi-pass extraction.')
+    arguments.add_argument('--parsers', nargs='+', choices=helper.PARSERS, help='backends, defaults to all installed')
+    arguments.add_argument('--repeat', type=int, default=200, help='timed calls per case')
+    arguments = arguments.parse_args(argv)
+
+    run(arguments.parsers, arguments.repeat)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+'''
+This module benchmarks scoped partial parsing against full-document parsing.
+
+For every get-method with a declared region, the saved fixture page is parsed once completely and
+once restricted to the region, before the parsing function is executed on the resulting document.
+Both the mean time per call and the peak memory of a single call are reported.
+
+Usage: python -m benchmarks.strainer [parser] [repeat]
+'''
+
+import os
+import sys
+import time
+import tracemalloc
+from helper import helper
+from websites.decorators import Parameters
+from websites.gamefaqs import gameparser
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'gamefaqs')
+
+CASES = [
+    ('base.html', gameparser.get_description, Parameters.Regions.DESCRIPTION),
+    ('base.html', gameparser.get_user_ratings, Parameters.Regions.USER_RATINGS),
+    ('base.html', gameparser.get_base_info, Parameters.Regions.BASE_INFO),
+    ('data.html', gameparser.get_title_data, Parameters.Regions.TITLE_DATA),
+    ('data.html', gameparser.get_versions, Parameters.Regions.VERSIONS),
+    ('data.html', gameparser.get_dlc, Parameters.Regions.DLC),
+    ('questions_answered.html', gameparser.get_questions, Parameters.Regions.QUESTIONS),
+    ('answer_details.html', gameparser.get_question_details, Parameters.Regions.QUESTION_DETAILS),
+    ('all_games.html', gameparser.get_all_games, Parameters.Regions.ALL_GAMES)]
+
+
+def measure(markup, func, parser, region, repeat):
+    '''
+    Returns the mean time in milliseconds and the peak memory in kilobytes of parsing the markup
+    and executing the parsing function on it.
+
+    :param markup: Markup of the fixture page.
+    :param func: Parsing function from the gameparser module.
+    :param parser: BeautifulSoup backend.
+    :param region: Region to be parsed. If None, the full page is parsed.
+    :param repeat: Number of timed calls.
+    '''
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(helper.get_document(markup, parser, region))
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    func(helper.get_document(markup, parser, region))
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def run(parser='html.parser', repeat=50):
+    '''
+    Runs all cases and prints a comparison table.
+
+    :param parser: BeautifulSoup backend.
+    :param repeat: Number of timed calls per case.
+    '''
+    print(f'{"function":<24}{"full ms":>10}{"region ms":>11}{"speedup":>9}{"full KiB":>11}{"region KiB":>12}')
+
+    for fixture, func, region in CASES:
+        with open(os.path.join(FIXTURES, fixture), encoding='utf-8') as file:
+            markup = file.read()
+
+        full_time, full_peak = measure(markup, func, parser, None, repeat)
+        region_time, region_peak = measure(markup, func, parser, region, repeat)
+
+        print(f'{func.__name__:<24}{full_time:>10.2f}{region_time:>11.2f}{full_time / region_time:>8.1f}x'
+              f'{full_peak:>11.0f}{region_peak:>12.0f}')
+
+
+if __name__ == '__main__':
+    run(*[int(arg) if arg.isdigit() else arg for arg in sys.argv[1:]])
@@ -0,0 +1,201 @@
+'''
+This module contains the asynchronous counterparts of the helper functions, based on aiohttp.
+'''
+
+import asyncio
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class Page:
+    '''
+    Fully read response of an asynchronous request, providing the attributes of a requests Response
+    used by the decorators.
+    '''
+    def __init__(self, url, status_code, headers, content, encoding):
+        '''
+        Initializes a Page instance.
+
+        :param url: URL of the response.
+        :param status_code: Status code of the response.
+        :param headers: Headers of the response.
+        :param content: Body of the response in bytes.
+        :param encoding: Encoding of the body.
+        '''
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        '''
+        Returns the decoded body of the response.
+        '''
+        return self.content.decode(self.encoding, errors='replace')
+
+    def close(self):
+        '''
+        Does nothing, as the body has already been read and the connection released.
+        '''
+        pass
+
+
+class AsyncTransport:
+    '''
+    Pooled asynchronous HTTP transport. A single transport is meant to be shared by all asynchronous website
+    models driven by the same event loop.
+    '''
+    def __init__(self, limit=100, limit_per_host=10, connect_timeout=5.0, read_timeout=30.0, keep_alive=True,
+                 limiter=None, retry=None, hedge=None):
+        '''
+        Initializes an AsyncTransport instance. The underlying client session is created on the first request,
+        as it has to be created inside the running event loop.
+
+        :param limit: Maximum number of open connections.
+        :param limit_per_host: Maximum number of open connections per host.
+        :param connect_timeout: Seconds to wait for a connection to be established.
+        :param read_timeout: Seconds to wait for the server to send data.
+        :param keep_alive: If true, connections are kept open after a request, if false, they are closed.
+        :param limiter: Optional RateLimiter of the ratelimiter module, which can be shared between several transports.
+        :param retry: Optional RetryPolicy of the retry module.
+        :param hedge: Optional HedgePolicy of the retry module.
+
+        :raise ImportError: If aiohttp is not installed, an ImportError will be raised.
+        '''
+        if not aiohttp:
+            raise ImportError('The asynchronous models require the package aiohttp.')
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.keep_alive = keep_alive
+        self.limiter = limiter
+        self.retry = retry
+        self.hedge = hedge
+        self.session = None
+
+    async def get(self, url, headers=None, page=None):
+        '''
+        Performs a GET request on a pooled connection and returns the fully read Page. The request is retried
+        according to the retry policy and hedged according to the hedge policy, if these are set.
+
+        :param url: URL to perform the request on.
+        :param headers: Header of the request.
+        :param page: Type of the requested page (base, advanced, search, ...).
+        '''
+        if not self.session:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host, force_close=not self.keep_alive)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+        attempt = 0
+
+        while True:
+            try:
+                response = await self.__hedged_get(url, headers, page)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if not self.retry or attempt + 1 >= self.retry.max_attempts:
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+
+            if self.retry and response.status_code in self.retry.status_codes and attempt + 1 < self.retry.max_attempts:
+                await asyncio.sleep(self.retry.delay(attempt, response.headers.get('Retry-After')))
+                attempt += 1
+                continue
+
+            return response
+
+    async def __hedged_get(self, url, headers, page):
+        '''
+        Performs a single request. If it has not returned after the threshold of the hedge policy, a duplicate
+        request is sent and the first successful response is returned, while the other one is cancelled.
+        '''
+        threshold = self.hedge.threshold(page) if self.hedge else None
+        if threshold is None:
+            return await self.__get(url, headers, page)
+
+        tasks = [asyncio.ensure_future(self.__get(url, headers, page))]
+        done, _ = await asyncio.wait(tasks, timeout=threshold)
+        if not done:
+            tasks.append(asyncio.ensure_future(self.__get(url, headers, page)))
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    return await task
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if all(pending.done() for pending in tasks):
+                        raise
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def __get(self, url, headers, page):
+        '''
+        Performs a single request and reads the full body, waiting for and reporting to the rate limiter if one is set.
+        '''
+        limiter = await self.limiter.acquire_async(url) if self.limiter else None
+        start = time.perf_counter()
+        status_code = None
+        retry_after = None
+
+        try:
+            async with self.session.get(url, headers=headers) as response:
+                content = await response.read()
+                status_code = response.status
+                retry_after = response.headers.get('Retry-After')
+                result = Page(str(response.url), response.status, response.headers, content,
+                              response.get_encoding())
+        finally:
+            latency = time.perf_counter() - start
+            if limiter:
+                limiter.release(status_code, latency, retry_after)
+
+        if self.hedge:
+            self.hedge.record(page, latency)
+
+        return result
+
+    async def close(self):
+        '''
+        Closes all pooled connections.
+        '''
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+
+async def get_response(url, headers=None, transport=None, page=None, metrics=None, site=None):
+    '''
+    Performs an asynchronous request for a given URL with headers if specified.
+
+    :param url: URL to perform the request on.
+    :param headers: Header of the request.
+    :param transport: AsyncTransport to perform the request with. If none is specified, a temporary one is used.
+    :param page: Type of the requested page, passed on to the transport.
+    :param metrics: Optional Metrics of the metrics module, recording latency, size and status code of the response.
+    :param site: Name of the website, with which the request is recorded.
+    '''
+    start = time.perf_counter() if metrics else None
+
+    if transport:
+        response = await transport.get(url, headers, page)
+    else:
+        transport = AsyncTransport()
+        try:
+            response = await transport.get(url, headers, page)
+        finally:
+            await transport.close()
+
+    if metrics:
+        metrics.record_request(site, page, response.status_code, time.perf_counter() - start, len(response.content))
+
+    return response
@@ -0,0 +1,174 @@
+'''
+This module contains a persistent response cache, which can be put in front of a transport.
+'''
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+TTLS = {
+    'search': 600,
+    'all_games': 3600,
+    'questions_answered': 3600,
+    'questions_unresolved': 3600,
+    'answers': 3600,
+    'base': 86400,
+    'advanced': 86400,
+    'reviews': 86400}
+
+
+class ResponseCache:
+    '''
+    SQLite-backed cache for successful responses.
+
+    The bodies are stored compressed. Every entry is fresh for the time to live of its page type, afterwards
+    it is revalidated with the ETag or Last-Modified header of the cached response, if the server provided one.
+    If the cache exceeds its maximum size, the least recently used entries are evicted.
+    '''
+    def __init__(self, path, max_size=256 * 1024 * 1024, ttls=None, default_ttl=3600):
+        '''
+        Initializes a ResponseCache instance.
+
+        :param path: Path of the SQLite database file.
+        :param max_size: Maximum size of all compressed bodies in bytes.
+        :param ttls: Dictionary mapping page types (base, advanced, search, ...) to their time to live in seconds.
+        Missing page types are taken from the module-level TTLS dictionary.
+        :param default_ttl: Time to live in seconds for page types neither found in ttls nor in TTLS.
+        '''
+        self.max_size = max_size
+        self.ttls = dict(TTLS, **ttls) if ttls else dict(TTLS)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'url TEXT PRIMARY KEY, page TEXT, headers TEXT, body BLOB, size INTEGER, '
+            'stored REAL, accessed REAL)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self.connection.commit()
+
+    def get(self, url):
+        '''
+        Returns the cached entry for a URL as a tuple of page type, headers, body and storage time,
+        or None if the URL is not cached.
+
+        :param url: URL of the cached response.
+        '''
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT page, headers, body, stored FROM responses WHERE url = ?', (url,)).fetchone()
+            if row:
+                self.connection.execute('UPDATE responses SET accessed = ? WHERE url = ?', (time.time(), url))
+                self.connection.commit()
+
+        if not row:
+            return None
+
+        page, headers, body, stored = row
+        return page, json.loads(headers), zlib.decompress(body), stored
+
+    def put(self, url, page, response):
+        '''
+        Stores a successful response and evicts the least recently used entries if the cache is full.
+
+        :param url: URL of the response.
+        :param page: Page type of the response.
+        :param response: Response with status code 200.
+        '''
+        headers = {key: response.headers[key] for key in ('Content-Type', 'ETag', 'Last-Modified')
+                   if key in response.headers}
+        body = zlib.compress(response.content)
+        now = time.time()
+
+        with self.lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, page, json.dumps(headers), body, len(body), now, now))
+            self.__evict()
+            self.connection.commit()
+
+    def refresh(self, url):
+        '''
+        Marks a cached entry as fresh again after a successful revalidation.
+
+        :param url: URL of the cached response.
+        '''
+        with self.lock:
+            self.connection.execute('UPDATE responses SET stored = ? WHERE url = ?', (time.time(), url))
+            self.connection.commit()
+
+    def is_fresh(self, page, stored):
+        '''
+        Returns true, if an entry of the given page type stored at the given time has not yet expired.
+
+        :param page: Page type of the entry.
+        :param stored: Storage time of the entry.
+        '''
+        return time.time() - stored < self.ttls.get(page, self.default_ttl)
+
+    def count(self, counter):
+        '''
+        Increments one of the counters hits, misses or revalidations.
+
+        :param counter: Name of the counter.
+        '''
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        '''
+        Returns the hit, miss and revalidation counters of the cache.
+        '''
+        return {
+            'Hits': self.hits,
+            'Misses': self.misses,
+            'Revalidations': self.revalidations}
+
+    def close(self):
+        '''
+        Closes the database connection.
+        '''
+        with self.lock:
+            self.connection.close()
+
+    def __evict(self):
+        '''
+        Deletes the least recently used entries until the size of the cache is below its maximum.
+        '''
+        size = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if size <= self.max_size:
+            return
+
+        for url, entry_size in self.connection.execute(
+                'SELECT url, size FROM responses ORDER BY accessed').fetchall():
+            self.connection.execute('DELETE FROM responses WHERE url = ?', (url,))
+            size -= entry_size
+            if size <= self.max_size:
+                break
+
+
+def build_response(url, headers, body):
+    '''
+    Returns a requests Response object for a cached body, so that it can be processed like a live response.
+
+    :param url: URL of the cached response.
+    :param headers: Dictionary of the cached headers.
+    :param body: Uncompressed body.
+    '''
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    response._content_consumed = True
+    return response
@@ -2,18 +2,288 @@
 This module conatins helper functions for recurring tasks in the main module.
 '''
 
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+from helper import cache
 
 
-def get_response(url, headers=None):
+PARSERS = ('html.parser', 'lxml', 'html5lib')
+default_parser = 'html.parser'
+strainers = dict()
+
+
+class Transport:
+    '''
+    Pooled HTTP transport, which keeps connections to a host alive and reuses them for subsequent requests.
+
+    A single transport can be owned by one website model or shared between several of them. In the latter case,
+    the transport has to be closed by whoever created it.
+    If a response cache is provided, fresh cached responses are returned without a request, stale ones are
+    revalidated by a conditional request.
+    If a rate limiter is provided, every request waits for a free slot of the limiter and reports its outcome to it.
+    If a retry policy is provided, failed requests are retried, if a hedge policy is provided, slow requests are
+    duplicated.
+    '''
+    def __init__(self, pool_connections=10, pool_maxsize=10, connect_timeout=5.0, read_timeout=30.0, keep_alive=True,
+                 cache=None, limiter=None, retry=None, hedge=None):
+        '''
+        Initializes a Transport instance.
+
+        :param pool_connections: Number of hosts, for which a connection pool is cached.
+        :param pool_maxsize: Maximum number of connections kept open per host.
+        :param connect_timeout: Seconds to wait for a connection to be established.
+        :param read_timeout: Seconds to wait for the server to send data.
+        :param keep_alive: If true, connections are kept open after a request, if false, they are closed.
+        :param cache: Optional ResponseCache of the cache module.
+        :param limiter: Optional RateLimiter of the ratelimiter module, which can be shared between several transports.
+        :param retry: Optional RetryPolicy of the retry module.
+        :param hedge: Optional HedgePolicy of the retry module.
+        '''
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = cache
+        self.limiter = limiter
+        self.retry = retry
+        self.hedge = hedge
+        self.executor = ThreadPoolExecutor(max_workers=pool_maxsize * 2) if hedge else None
+        self.session = requests.Session()
+        self.session.headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, headers=None, page=None, stream=False):
+        '''
+        Performs a GET request on a pooled connection.
+
+        :param url: URL to perform the request on.
+        :param headers: Header of the request.
+        :param page: Type of the requested page (base, advanced, search, ...), determining the time to live
+        of the response in the cache.
+        :param stream: If true, the request returns as soon as the headers are received, leaving the body to be
+        streamed. Responses, which are stored in the cache, are read completely nevertheless.
+        '''
+        if not self.cache:
+            return self.request(url, headers, page, stream)
+
+        entry = self.cache.get(url)
+        if entry:
+            cached_page, cached_headers, body, stored = entry
+            if self.cache.is_fresh(page if page else cached_page, stored):
+                self.cache.count('hits')
+                return cache.build_response(url, cached_headers, body)
+
+            headers = dict(headers) if headers else dict()
+            if 'ETag' in cached_headers:
+                headers['If-None-Match'] = cached_headers['ETag']
+            if 'Last-Modified' in cached_headers:
+                headers['If-Modified-Since'] = cached_headers['Last-Modified']
+
+        response = self.request(url, headers, page, stream)
+
+        if entry and response.status_code == 304:
+            response.close()
+            self.cache.refresh(url)
+            self.cache.count('revalidations')
+            return cache.build_response(url, cached_headers, body)
+
+        self.cache.count('misses')
+        if response.status_code == 200:
+            self.cache.put(url, page, response)
+
+        return response
+
+    def request(self, url, headers=None, page=None, stream=False):
+        '''
+        Performs a GET request on a pooled connection, bypassing the cache. The request is retried
+        according to the retry policy, if one is set.
+
+        :param url: URL to perform the request on.
+        :param headers: Header of the request.
+        :param page: Type of the requested page, determining the hedging threshold.
+        :param stream: If true, the request returns as soon as the headers are received, leaving the body to be
+        streamed. The latencies reported to the rate limiter and the hedge policy are then the times to the headers.
+        '''
+        attempt = 0
+
+        while True:
+            try:
+                response = self.__hedged_request(url, headers, page, stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if not self.retry or attempt + 1 >= self.retry.max_attempts:
+                    raise
+                time.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+
+            if self.retry and response.status_code in self.retry.status_codes and attempt + 1 < self.retry.max_attempts:
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+                time.sleep(self.retry.delay(attempt, retry_after))
+                attempt += 1
+                continue
+
+            return response
+
+    def close(self):
+        '''
+        Closes all pooled connections.
+        '''
+        if self.executor:
+            self.executor.shutdown(wait=False)
+        self.session.close()
+
+    def __hedged_request(self, url, headers, page, stream):
+        '''
+        Performs a single request. If it has not returned after the threshold of the hedge policy, a duplicate
+        request is sent and the first successful response is returned, while the other one is closed.
+        '''
+        threshold = self.hedge.threshold(page) if self.hedge else None
+        if threshold is None:
+            return self.__request(url, headers, page, stream)
+
+        futures = [self.executor.submit(self.__request, url, headers, page, stream)]
+        if not wait(futures, timeout=threshold)[0]:
+            futures.append(self.executor.submit(self.__request, url, headers, page, stream))
+
+        winner = None
+        for future in as_completed(futures):
+            if not future.exception():
+                winner = future
+                break
+
+        if not winner:
+            return futures[0].result()
+
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(close_response)
+
+        return winner.result()
+
+    def __request(self, url, headers, page, stream):
+        '''
+        Performs a single request, waiting for and reporting to the rate limiter if one is set.
+        '''
+        limiter = self.limiter.acquire(url) if self.limiter else None
+        start = time.perf_counter()
+        status_code = None
+        retry_after = None
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+            status_code = response.status_code
+            retry_after = response.headers.get('Retry-After')
+        finally:
+            latency = time.perf_counter() - start
+            if limiter:
+                limiter.release(status_code, latency, retry_after)
+
+        if self.hedge:
+            self.hedge.record(page, latency)
+
+        return response
+
+
+def close_response(future):
+    '''
+    Closes the response of a completed request future, if the request succeeded.
+
+    :param future: Future of a request, which is not used anymore.
+    '''
+    if not future.exception():
+        future.result().close()
+
+
+def get_response(url, headers=None, transport=None, page=None, metrics=None, site=None):
     '''
     Performs a request for a given URL with headers if specified.
 
     :param url: URL to perform the request on.
     :param headers: Header of the request. If none is specified, the standard requests header will be used.
     In this case, the requests will end wit status code 403.
+    :param transport: Transport to perform the request with. If none is specified, a new connection is opened.
+    :param page: Type of the requested page, passed on to the transport.
+    :param metrics: Optional Metrics of the metrics module, recording latency, size and status code of the response.
+    :param site: Name of the website, with which the request is recorded.
     '''
-    if headers:
-        return requests.get(url, headers=headers)
+    start = time.perf_counter() if metrics else None
+
+    if transport:
+        response = transport.get(url, headers, page)
+    elif headers:
+        response = requests.get(url, headers=headers)
     else:
-        return requests.get(url)
\ No newline at end of file
+        response = requests.get(url)
+
+    if metrics:
+        metrics.record_request(site, page, response.status_code, time.perf_counter() - start, len(response.content))
+
+    return response
+
+
+def set_default_parser(parser):
+    '''
+    Sets the process-wide default BeautifulSoup backend, which is used by all website models
+    without an explicitly specified parser.
+
+    :param parser: Name of the backend, one of html.parser, lxml or html5lib.
+
+    :raise ValueError: If the specified parser is not supported, a ValueError will be raised.
+    '''
+    global default_parser
+
+    if parser not in PARSERS:
+        raise ValueError(f'Unsupported parser \'{parser}\'. Supported parsers: {", ".join(PARSERS)}.')
+    default_parser = parser
+
+
+def get_region(region, parser=None):
+    '''
+    Returns the region of a page, which is actually parsed by a backend. html5lib does not support
+    restricting the parse to a region, so it always parses the full page, and None is returned for it.
+
+    :param region: Tuple of tag name, attribute and attribute value(s), or None for the full page.
+    :param parser: BeautifulSoup backend. If none is specified, the process-wide default parser is assumed.
+    '''
+    return None if (parser if parser else default_parser) == 'html5lib' else region
+
+
+def get_strainer(region):
+    '''
+    Returns a SoupStrainer matching the elements of a page region.
+
+    Class attributes are matched by a regular expression on the single class names, as the attribute
+    values are not yet split into lists when the strainer is applied during parsing.
+    The strainers are cached, as every region is strained repeatedly.
+
+    :param region: Tuple of tag name, attribute and attribute value(s). Multiple attribute values have to be
+    passed as a tuple.
+    '''
+    if region not in strainers:
+        name, attribute, values = region
+        values = values if isinstance(values, tuple) else (values,)
+        pattern = re.compile(r'(^|\s)({})(\s|$)'.format('|'.join(re.escape(value) for value in values)))
+        strainers[region] = SoupStrainer(name, attrs={attribute: pattern})
+
+    return strainers[region]
+
+
+def get_document(markup, parser=None, region=None):
+    '''
+    Returns a BeautifulSoup object for the given markup.
+
+    :param markup: Markup of the page to be parsed.
+    :param parser: BeautifulSoup backend to parse the markup with. If none is specified, the process-wide
+    default parser will be used.
+    :param region: Tuple of tag name, attribute and attribute value(s). If specified, only the matching elements
+    and their descendants are parsed, unless the backend is html5lib.
+    '''
+    if get_region(region, parser):
+        return BeautifulSoup(markup, parser if parser else default_parser, parse_only=get_strainer(region))
+
+    return BeautifulSoup(markup, parser if parser else default_parser)
@@ -0,0 +1,193 @@
+'''
+This module contains the instrumentation of requests and parsing, which can be passed to the website models.
+'''
+
+import bisect
+import threading
+
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HISTOGRAMS = {
+    'request_seconds': 'Latency of the requests in seconds.',
+    'soup_seconds': 'Time spent building BeautifulSoup documents in seconds.',
+    'parse_seconds': 'Time spent in the parsing functions in seconds.'}
+
+COUNTERS = {
+    'response_bytes_total': 'Bytes of the received response bodies.',
+    'responses_total': 'Number of received responses by status code.'}
+
+
+class Metrics:
+    '''
+    Collects request latencies, downloaded bytes, status codes, document build times and parsing times,
+    labelled by site and page type. A single instance can be shared by all website models of a process.
+    The collected metrics are returned as dictionary by stats and in the Prometheus text format by prometheus.
+    '''
+    def __init__(self, buckets=BUCKETS, prefix='completewasteoftime'):
+        '''
+        Initializes a Metrics instance.
+
+        :param buckets: Upper bounds of the histogram buckets in seconds.
+        :param prefix: Prefix of the metric names in the Prometheus text format.
+        '''
+        self.buckets = buckets
+        self.prefix = prefix
+        self.histograms = {name: dict() for name in HISTOGRAMS}
+        self.counters = {name: dict() for name in COUNTERS}
+        self.lock = threading.Lock()
+
+    def record_request(self, site, page, status_code, seconds, size):
+        '''
+        Records a completed request.
+
+        :param site: Name of the website, e.g. gamefaqs.
+        :param page: Type of the requested page (base, advanced, search, ...).
+        :param status_code: Status code of the response.
+        :param seconds: Latency of the request.
+        :param size: Size of the response body in bytes.
+        '''
+        labels = (('site', site), ('page', page))
+
+        with self.lock:
+            self.__observe('request_seconds', labels, seconds)
+            self.__increment('response_bytes_total', labels, size)
+            self.__increment('responses_total', labels + (('status', str(status_code)),), 1)
+
+    def record_soup(self, site, page, parser, seconds):
+        '''
+        Records the time spent building a BeautifulSoup document.
+
+        :param site: Name of the website.
+        :param page: Type of the parsed page.
+        :param parser: BeautifulSoup backend, None for the default backend.
+        :param seconds: Time spent building the document.
+        '''
+        with self.lock:
+            self.__observe('soup_seconds', (('site', site), ('page', page), ('parser', parser or 'default')), seconds)
+
+    def record_parse(self, site, page, function, seconds):
+        '''
+        Records the time spent in a parsing function.
+
+        :param site: Name of the website.
+        :param page: Type of the parsed page.
+        :param function: Name of the parsing function.
+        :param seconds: Time spent in the parsing function.
+        '''
+        with self.lock:
+            self.__observe('parse_seconds', (('site', site), ('page', page), ('function', function)), seconds)
+
+    def stats(self, site=None):
+        '''
+        Returns the collected metrics as dictionary, optionally restricted to a single site.
+
+        The dictionary has the keys Requests (by page type: count, seconds, bytes and status codes),
+        Soup (by page type: count and seconds) and Parse (by parsing function: count and seconds).
+
+        :param site: Name of the website. If none is provided, the metrics of all sites are summed up.
+        '''
+        result = {
+            'Requests': dict(),
+            'Soup': dict(),
+            'Parse': dict()}
+
+        with self.lock:
+            for name, section, key in (
+                    ('request_seconds', 'Requests', 'page'),
+                    ('soup_seconds', 'Soup', 'page'),
+                    ('parse_seconds', 'Parse', 'function')):
+                for labels, (_, total, count) in self.histograms[name].items():
+                    labels = dict(labels)
+                    if site and labels['site'] != site:
+                        continue
+                    entry = result[section].setdefault(labels[key], {'Count': 0, 'Seconds': 0.0})
+                    entry['Count'] += count
+                    entry['Seconds'] += total
+
+            for labels, value in self.counters['response_bytes_total'].items():
+                labels = dict(labels)
+                if not site or labels['site'] == site:
+                    entry = result['Requests'][labels['page']]
+                    entry['Bytes'] = entry.get('Bytes', 0) + value
+
+            for labels, value in self.counters['responses_total'].items():
+                labels = dict(labels)
+                if not site or labels['site'] == site:
+                    status_codes = result['Requests'][labels['page']].setdefault('Status-Codes', dict())
+                    status_codes[labels['status']] = status_codes.get(labels['status'], 0) + value
+
+        return result
+
+    def prometheus(self):
+        '''
+        Returns all collected metrics in the Prometheus text exposition format.
+        '''
+        lines = list()
+
+        with self.lock:
+            for name, description in HISTOGRAMS.items():
+                metric = f'{self.prefix}_{name}'
+                lines += [f'# HELP {metric} {description}', f'# TYPE {metric} histogram']
+                for labels, (buckets, total, count) in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, bucket in zip(self.buckets, buckets):
+                        cumulative += bucket
+                        lines.append(f'{metric}_bucket{format_labels(labels + (("le", repr(bound)),))} {cumulative}')
+                    lines.append(f'{metric}_bucket{format_labels(labels + (("le", "+Inf"),))} {count}')
+                    lines.append(f'{metric}_sum{format_labels(labels)} {total}')
+                    lines.append(f'{metric}_count{format_labels(labels)} {count}')
+
+            for name, description in COUNTERS.items():
+                metric = f'{self.prefix}_{name}'
+                lines += [f'# HELP {metric} {description}', f'# TYPE {metric} counter']
+                for labels, value in sorted(self.counters[name].items()):
+                    lines.append(f'{metric}{format_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        '''
+        Discards all collected metrics.
+        '''
+        with self.lock:
+            self.histograms = {name: dict() for name in HISTOGRAMS}
+            self.counters = {name: dict() for name in COUNTERS}
+
+    def __observe(self, name, labels, value):
+        '''
+        Adds a value to a histogram. The lock must be held.
+        '''
+        histogram = self.histograms[name].get(labels)
+        if not histogram:
+            histogram = self.histograms[name][labels] = [[0] * len(self.buckets), 0.0, 0]
+
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            histogram[0][index] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    def __increment(self, name, labels, value):
+        '''
+        Adds a value to a counter. The lock must be held.
+        '''
+        self.counters[name][labels] = self.counters[name].get(labels, 0) + value
+
+
+def format_labels(labels):
+    '''
+    Returns labels in the Prometheus text format, e.g. {site="gamefaqs",page="base"}.
+
+    :param labels: Tuple of label name and value pairs.
+    '''
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in labels) + '}'
+
+
+def escape(value):
+    '''
+    Returns a label value with backslashes, quotes and line breaks escaped.
+
+    :param value: Label value.
+    '''
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,284 @@
+'''
+This module contains an opt-in profiler for the website models, capturing cProfile statistics and the top
+memory allocators of the requests, document builds and parsing functions.
+'''
+
+import atexit
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import random
+import sys
+import threading
+import tracemalloc
+
+
+ENVIRONMENT = 'COMPLETEWASTEOFTIME_PROFILE'
+
+GROUPS = {
+    'Parsers': (os.path.join('', 'websites', ''),),
+    'BeautifulSoup': (
+        os.path.join('', 'bs4', ''), os.path.join('', 'lxml', ''), os.path.join('', 'html5lib', ''),
+        os.path.join('html', 'parser.py')),
+    'Transport': (
+        os.path.join('', 'helper', ''), os.path.join('', 'requests', ''), os.path.join('', 'urllib3', ''),
+        'socket.py', 'ssl.py')}
+
+default = None
+
+# Only one cProfile profiler can be enabled at a time in a process since Python 3.12, so calls of all Profilers
+# are profiled one at a time.
+profiling = threading.Lock()
+
+# The tracemalloc tracing is shared by all Profilers. It is started by the first Profiler tracing allocations and
+# stopped when the last one is done, unless it was already started by someone else.
+tracing_lock = threading.Lock()
+tracers = 0
+owns_tracing = False
+
+names = itertools.count(1)
+
+
+class Profiler:
+    '''
+    Profiles a bounded window of calls. The first calls, or a random sample of them, are executed under cProfile,
+    while tracemalloc traces the memory allocations. As soon as the window is full, or the profiler is closed,
+    the statistics are written to the output directory: the cProfile statistics (name.prof, readable by pstats
+    or snakeviz), the top allocators (name-allocations.txt) and a summary of the top functions in the parsing
+    functions, BeautifulSoup and the transport (name-summary.txt), which is also written to stderr.
+
+    Every call is profiled in the thread executing it, nested calls are part of the outermost profiled call.
+    A single instance can be shared by several website models and threads. As cProfile cannot profile several
+    threads at once, only one call is profiled at a time in the whole process, calls starting meanwhile
+    are executed without being profiled and do not count towards the window.
+    '''
+    def __init__(self, directory='profiles', calls=100, sample=1.0, allocations=True, top=10, name=None):
+        '''
+        Initializes a Profiler instance.
+
+        :param directory: Output directory, which is created if it does not exist.
+        :param calls: Number of calls to be profiled.
+        :param sample: Probability of a call to be profiled, until the window is full.
+        :param allocations: If true, the memory allocations are traced as well.
+        :param top: Number of functions per group and allocators in the summary.
+        :param name: Base name of the output files. Defaults to profile-{process id}-{number of the profiler}.
+        '''
+        self.directory = directory
+        self.calls = calls
+        self.sample = sample
+        self.allocations = allocations
+        self.top = top
+        self.name = name if name else f'profile-{os.getpid()}-{next(names)}'
+        self.started = 0
+        self.finished = 0
+        self.stats = None
+        self.snapshot = None
+        self.tracing = False
+        self.done = False
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def call(self, func, *args, **kwargs):
+        '''
+        Executes a function with the given arguments and returns its result. The call is profiled, if the window
+        is not yet full and it is sampled.
+
+        :param func: Function to be executed.
+        '''
+        if self.done or getattr(self.local, 'active', False):
+            return func(*args, **kwargs)
+
+        # Calls starting while another call is profiled, in any thread and by any Profiler, are not profiled.
+        if not profiling.acquire(blocking=False):
+            return func(*args, **kwargs)
+
+        with self.lock:
+            profiled = self.started < self.calls and (self.sample >= 1 or random.random() < self.sample)
+            if profiled:
+                self.started += 1
+                if self.allocations and not self.tracing:
+                    start_tracing()
+                    self.tracing = True
+
+        if not profiled:
+            profiling.release()
+            return func(*args, **kwargs)
+
+        self.local.active = True
+        profile = cProfile.Profile()
+        profile.enable()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            self.local.active = False
+            profiling.release()
+
+            with self.lock:
+                if self.stats:
+                    self.stats.add(profile)
+                else:
+                    self.stats = pstats.Stats(profile)
+                self.finished += 1
+                full = self.finished >= self.calls
+
+            if full:
+                self.dump()
+
+    def summary(self):
+        '''
+        Returns the summary of the profiled calls: the functions with the highest own time in the parsing functions,
+        BeautifulSoup and the transport, and the top allocators.
+        '''
+        return self.__summarize(self.__copy_stats())
+
+    def __summarize(self, stats):
+        '''
+        Returns the summary of the given statistics, see summary.
+        '''
+        lines = [f'Profiled calls: {self.finished}']
+
+        if stats:
+            total = stats.total_tt
+            for group, patterns in GROUPS.items():
+                functions = [
+                    (own, cumulative, calls, f'{os.path.basename(file)}:{line}({function})')
+                    for (file, line, function), (_, calls, own, cumulative, _) in stats.stats.items()
+                    if any(pattern in file for pattern in patterns)]
+                functions.sort(reverse=True)
+                own_time = sum(function[0] for function in functions)
+
+                lines.append(f'\n{group}: {own_time:.3f}s own time ({own_time / total if total else 0:.0%})')
+                lines.append(f'{"own s":>9}{"cum s":>9}{"calls":>9}  function')
+                for own, cumulative, calls, function in functions[:self.top]:
+                    lines.append(f'{own:>9.3f}{cumulative:>9.3f}{calls:>9}  {function}')
+
+        if self.snapshot:
+            lines.append('\nTop allocators:')
+            for statistic in self.snapshot.statistics('lineno')[:self.top]:
+                lines.append(f'{statistic.size / 1024:>9.0f} KiB{statistic.count:>9}  {statistic.traceback}')
+
+        return '\n'.join(lines) + '\n'
+
+    def dump(self):
+        '''
+        Stops profiling and writes the statistics, the top allocators and the summary to the output directory.
+        Subsequent calls are executed without being profiled.
+        '''
+        with self.lock:
+            if self.done:
+                return
+            self.done = True
+
+            if self.tracing:
+                self.snapshot = tracemalloc.take_snapshot().filter_traces((
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, cProfile.__file__),
+                    tracemalloc.Filter(False, pstats.__file__),
+                    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+                    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>')))
+                stop_tracing()
+                self.tracing = False
+
+        # Calls still running when profiling stops add their statistics afterwards, so a copy is written.
+        stats = self.__copy_stats()
+        if not stats:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, self.name)
+        stats.dump_stats(path + '.prof')
+
+        if self.snapshot:
+            with open(path + '-allocations.txt', 'w', encoding='utf-8') as file:
+                for statistic in self.snapshot.statistics('traceback')[:self.top * 5]:
+                    file.write(f'{statistic.size / 1024:.0f} KiB in {statistic.count} blocks\n')
+                    file.write('\n'.join(statistic.traceback.format()) + '\n\n')
+
+        summary = self.__summarize(stats)
+        with open(path + '-summary.txt', 'w', encoding='utf-8') as file:
+            file.write(summary)
+            stream = io.StringIO()
+            pstats.Stats(path + '.prof', stream=stream).sort_stats('cumulative').print_stats(30)
+            file.write('\n' + stream.getvalue())
+
+        sys.stderr.write(summary)
+
+    def __copy_stats(self):
+        '''
+        Returns a copy of the statistics of all profiled calls, or None if no call has been profiled.
+        '''
+        with self.lock:
+            if not self.stats:
+                return None
+            stats = pstats.Stats()
+            stats.add(self.stats)
+
+        return stats
+
+
+def start_tracing():
+    '''
+    Registers a Profiler tracing allocations and starts tracemalloc, if it is not tracing yet.
+    '''
+    global tracers, owns_tracing
+
+    with tracing_lock:
+        if tracers == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            owns_tracing = True
+        tracers += 1
+
+
+def stop_tracing():
+    '''
+    Unregisters a Profiler tracing allocations and stops tracemalloc, if it was the last one
+    and tracemalloc was started by a Profiler.
+    '''
+    global tracers, owns_tracing
+
+    with tracing_lock:
+        tracers -= 1
+        if tracers == 0 and owns_tracing:
+            tracemalloc.stop()
+            owns_tracing = False
+
+
+def get_default_profiler():
+    '''
+    Returns the process-wide Profiler configured by the environment variable COMPLETEWASTEOFTIME_PROFILE,
+    or None if it is not set. The variable is either 1, or the output directory, optionally followed by a colon
+    and the number of calls, e.g. profiles:500. The statistics are written when the window is full,
+    at the latest when the process exits.
+    '''
+    global default
+
+    value = os.environ.get(ENVIRONMENT)
+    if not value or value == '0':
+        return None
+
+    if not default:
+        directory, _, calls = value.partition(':')
+        default = Profiler(
+            directory=directory if directory != '1' else 'profiles',
+            calls=int(calls) if calls else 100)
+        atexit.register(default.dump)
+
+    return default
+
+
+def get_profiler(profile=None):
+    '''
+    Returns the Profiler to be used by a website model for the given profile argument: the Profiler itself
+    if one is passed, a new Profiler if it is true, the process-wide default Profiler if it is None, else None.
+
+    :param profile: Profile argument of the website model.
+    '''
+    if isinstance(profile, Profiler):
+        return profile
+    if profile is None:
+        return get_default_profiler()
+    return Profiler() if profile else None
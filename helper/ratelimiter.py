@@ -0,0 +1,196 @@
+'''
+This module contains an adaptive rate limiter, which can be shared by all transports
+requesting pages from the same hosts.
+'''
+
+import asyncio
+import email.utils
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class HostLimiter:
+    '''
+    Limits the requests to a single host by a token bucket and an adaptive concurrency limit.
+
+    The token bucket caps the request rate. The concurrency limit follows the AIMD scheme: It grows additively
+    by one per window of successful requests and shrinks multiplicatively if the host answers with 429 or 503,
+    or the request fails. Optionally, a latency above the tolerated multiple of the lowest observed latency
+    counts as overload as well. As this latency is smoothed over all page types, it is only meaningful
+    for hosts serving pages of similar size, so it is disabled by default.
+    A Retry-After header blocks all requests to the host for the given time.
+    '''
+    def __init__(self, rate=5.0, burst=10, concurrency=4, min_concurrency=1, max_concurrency=32,
+                 decrease=0.5, latency_tolerance=None):
+        '''
+        Initializes a HostLimiter instance.
+
+        :param rate: Maximum number of requests per second.
+        :param burst: Maximum number of requests sent at once after a period of inactivity.
+        :param concurrency: Initial number of concurrent requests.
+        :param min_concurrency: Lower bound of the concurrency limit.
+        :param max_concurrency: Upper bound of the concurrency limit.
+        :param decrease: Factor, by which the concurrency limit is multiplied on overload.
+        :param latency_tolerance: Multiple of the lowest observed latency, above which the host is considered overloaded.
+        If None (default), the latency is not taken into account.
+        '''
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.limit = float(concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.latency = None
+        self.min_latency = None
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.decreased = 0.0
+        self.lock = threading.Lock()
+
+    def try_acquire(self):
+        '''
+        Acquires a slot for a request, if both a token and a free concurrency slot are available.
+        Returns 0 in that case, else the number of seconds to wait before trying again.
+        '''
+        with self.lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.in_flight >= int(self.limit):
+                return self.latency / self.limit if self.latency else 0.01
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+
+            self.tokens -= 1
+            self.in_flight += 1
+            return 0
+
+    def release(self, status_code, latency, retry_after=None):
+        '''
+        Releases the slot of a finished request and adapts the concurrency limit.
+
+        :param status_code: Status code of the response, None if the request failed.
+        :param latency: Seconds the request took.
+        :param retry_after: Value of the Retry-After header of the response, if any.
+        '''
+        with self.lock:
+            now = time.monotonic()
+            self.in_flight -= 1
+
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + parse_retry_after(retry_after))
+
+            overloaded = status_code in (None, 429, 503)
+            if not overloaded:
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+                if self.latency_tolerance:
+                    overloaded = self.latency > self.min_latency * self.latency_tolerance
+
+            if overloaded:
+                # Decrease at most once per round trip, as all requests in flight see the same overload.
+                if now - self.decreased > (self.latency if self.latency else 1.0):
+                    self.limit = max(self.min_concurrency, self.limit * self.decrease)
+                    self.decreased = now
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+
+class RateLimiter:
+    '''
+    Rate limiter holding a HostLimiter for every requested host. A single instance is meant to be shared by
+    all transports of a process.
+    '''
+    def __init__(self, hosts=None, **defaults):
+        '''
+        Initializes a RateLimiter instance.
+
+        :param hosts: Dictionary mapping host names to dictionaries of HostLimiter parameters for that host.
+        :param defaults: HostLimiter parameters for all other hosts.
+        '''
+        self.hosts = hosts if hosts else dict()
+        self.defaults = defaults
+        self.limiters = dict()
+        self.lock = threading.Lock()
+
+    def get_limiter(self, url):
+        '''
+        Returns the HostLimiter for the host of the given URL.
+
+        :param url: URL to be requested.
+        '''
+        host = urlsplit(url).hostname
+
+        with self.lock:
+            if host not in self.limiters:
+                self.limiters[host] = HostLimiter(**self.hosts.get(host, self.defaults))
+            return self.limiters[host]
+
+    def acquire(self, url):
+        '''
+        Blocks until a request for the given URL may be sent and returns the HostLimiter, whose slot was acquired.
+
+        :param url: URL to be requested.
+        '''
+        limiter = self.get_limiter(url)
+        wait = limiter.try_acquire()
+
+        while wait:
+            time.sleep(wait)
+            wait = limiter.try_acquire()
+
+        return limiter
+
+    async def acquire_async(self, url):
+        '''
+        Waits without blocking the event loop until a request for the given URL may be sent and returns the
+        HostLimiter, whose slot was acquired.
+
+        :param url: URL to be requested.
+        '''
+        limiter = self.get_limiter(url)
+        wait = limiter.try_acquire()
+
+        while wait:
+            await asyncio.sleep(wait)
+            wait = limiter.try_acquire()
+
+        return limiter
+
+    def stats(self):
+        '''
+        Returns the current concurrency limit, requests in flight and request rate per host.
+        '''
+        with self.lock:
+            return {
+                host: {
+                    'Concurrency': limiter.limit,
+                    'In-Flight': limiter.in_flight,
+                    'Rate': limiter.rate}
+                for host, limiter in self.limiters.items()}
+
+
+def parse_retry_after(value):
+    '''
+    Returns the number of seconds given by a Retry-After header, which can either be a number of seconds
+    or an HTTP date.
+
+    :param value: Value of the Retry-After header.
+    '''
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
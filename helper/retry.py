@@ -0,0 +1,100 @@
+'''
+This module contains the policies for retrying failed requests and hedging slow ones.
+'''
+
+import random
+import threading
+from collections import deque
+from helper.ratelimiter import parse_retry_after
+
+
+class RetryPolicy:
+    '''
+    Policy for retrying requests, which failed with a connection error, a timeout or one of the given status codes.
+    The delay between two attempts grows exponentially and is randomized by full jitter, but is never shorter
+    than a Retry-After header of the failed response.
+    '''
+    def __init__(self, status_codes=(429, 500, 502, 503, 504), max_attempts=3, backoff=0.5, max_backoff=30.0,
+                 jitter=True):
+        '''
+        Initializes a RetryPolicy instance.
+
+        :param status_codes: Status codes, which lead to a retry.
+        :param max_attempts: Maximum number of attempts, including the first one.
+        :param backoff: Delay in seconds before the first retry, doubled for every further retry.
+        :param max_backoff: Upper bound of the delay in seconds.
+        :param jitter: If true, the delay is drawn uniformly between zero and the exponential delay.
+        '''
+        self.status_codes = status_codes
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def delay(self, attempt, retry_after=None):
+        '''
+        Returns the number of seconds to wait before the next attempt.
+
+        :param attempt: Number of the failed attempt, starting at 0.
+        :param retry_after: Value of the Retry-After header of the failed response, if any.
+        '''
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return max(delay, parse_retry_after(retry_after)) if retry_after else delay
+
+
+class HedgePolicy:
+    '''
+    Policy for hedging requests: If a request has not returned after a threshold, a duplicate request is sent
+    and whichever response arrives first is used.
+
+    The threshold is either fixed or the given percentile of the recent latencies of the same page type.
+    In the latter case, no request is hedged until enough latencies have been recorded.
+    '''
+    def __init__(self, delay=None, percentile=0.95, min_samples=20, window=200):
+        '''
+        Initializes a HedgePolicy instance.
+
+        :param delay: Fixed threshold in seconds. If none is provided, the percentile of recent latencies is used.
+        :param percentile: Percentile of the recent latencies used as threshold.
+        :param min_samples: Number of latencies per page type needed before requests are hedged.
+        :param window: Number of recent latencies kept per page type.
+        '''
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.latencies = dict()
+        self.lock = threading.Lock()
+
+    def record(self, page, latency):
+        '''
+        Records the latency of a completed request.
+
+        :param page: Type of the requested page.
+        :param latency: Seconds the request took.
+        '''
+        with self.lock:
+            if page not in self.latencies:
+                self.latencies[page] = deque(maxlen=self.window)
+            self.latencies[page].append(latency)
+
+    def threshold(self, page):
+        '''
+        Returns the number of seconds after which a request for the given page type is hedged,
+        or None if it must not be hedged yet.
+
+        :param page: Type of the requested page.
+        '''
+        if self.delay is not None:
+            return self.delay
+
+        with self.lock:
+            latencies = sorted(self.latencies.get(page, ()))
+
+        if len(latencies) < self.min_samples:
+            return None
+
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.percentile))]
@@ -0,0 +1,276 @@
+'''
+This module contains the streaming fetch-and-parse path, which builds the BeautifulSoup object of a page
+while its compressed body is still being downloaded.
+'''
+
+import codecs
+import re
+import time
+import requests
+from bs4 import BeautifulSoup
+from bs4.builder import ParserRejectedMarkup
+from bs4.builder._htmlparser import BeautifulSoupHTMLParser, HTMLParserTreeBuilder
+from helper import helper
+
+try:
+    from lxml import etree
+    from bs4.builder._lxml import LXMLTreeBuilder
+except ImportError:
+    etree = None
+    LXMLTreeBuilder = None
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+CHUNK_SIZE = 16 * 1024
+PRESCAN_SIZE = 1024
+DEFAULT_CHARSET = 'utf-8'
+
+HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([-\w.:]+)', re.IGNORECASE)
+META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([-\w.:]+)', re.IGNORECASE)
+
+
+class Body:
+    '''
+    Iterator over the decompressed chunks of a streamed response body.
+
+    The size of the body is checked against the maximum size while it is downloaded, and the time spent
+    waiting for the chunks is measured, so that it can be told apart from the time spent parsing them.
+    '''
+    def __init__(self, response, max_size=None, chunk_size=CHUNK_SIZE):
+        '''
+        Initializes a Body instance.
+
+        :param response: Response of a request performed with stream set to true.
+        :param max_size: Maximum size of the decompressed body in bytes. If None, the size is not limited.
+        :param chunk_size: Number of bytes read at once.
+        '''
+        self.url = response.url
+        self.chunks = response.iter_content(chunk_size)
+        self.max_size = max_size
+        self.size = 0
+        self.waiting = 0.0
+        self.head = list()
+
+    def __iter__(self):
+        while self.head:
+            yield self.head.pop(0)
+
+        for chunk in iter(self.next, None):
+            yield chunk
+
+    def prescan(self):
+        '''
+        Reads the first chunks of the body until at least PRESCAN_SIZE bytes are available and returns them.
+        The chunks are yielded nevertheless, when the body is iterated.
+        '''
+        while sum(len(chunk) for chunk in self.head) < PRESCAN_SIZE:
+            chunk = self.next()
+            if chunk is None:
+                break
+            self.head.append(chunk)
+
+        return b''.join(self.head)
+
+    def next(self):
+        '''
+        Returns the next chunk of the body, or None if the body has been read completely.
+
+        :raise RuntimeError: If the body exceeds the maximum size, a RuntimeError will be raised.
+        '''
+        start = time.perf_counter()
+        chunk = next(self.chunks, None)
+        self.waiting += time.perf_counter() - start
+
+        if chunk is not None:
+            self.size += len(chunk)
+            if self.max_size and self.size > self.max_size:
+                raise RuntimeError(f'The body of {self.url} exceeds the maximum size of {self.max_size} bytes.')
+
+        return chunk
+
+
+class StreamingHTMLParserTreeBuilder(HTMLParserTreeBuilder):
+    '''
+    Tree builder for html.parser, which decodes the chunks of a body incrementally and feeds them into the parser
+    as soon as they arrive, instead of parsing the markup passed to BeautifulSoup.
+    '''
+    def __init__(self, body, charset, **kwargs):
+        '''
+        Initializes a StreamingHTMLParserTreeBuilder instance.
+
+        :param body: Iterable of the chunks of the body.
+        :param charset: Charset of the body.
+        '''
+        super(StreamingHTMLParserTreeBuilder, self).__init__(**kwargs)
+        self.body = body
+        self.charset = charset
+
+    def feed(self, markup):
+        if self.body is None:
+            raise ParserRejectedMarkup('The body has already been consumed.')
+
+        body, self.body = self.body, None
+        args, kwargs = self.parser_args
+        parser = BeautifulSoupHTMLParser(self.soup, *args, **kwargs)
+        decoder = codecs.getincrementaldecoder(self.charset)(errors='replace')
+
+        try:
+            for chunk in body:
+                parser.feed(decoder.decode(chunk))
+            parser.feed(decoder.decode(b'', final=True))
+            parser.close()
+        except AssertionError as error:
+            raise ParserRejectedMarkup(error)
+        parser.already_closed_empty_element = []
+
+
+if LXMLTreeBuilder:
+    class StreamingLXMLTreeBuilder(LXMLTreeBuilder):
+        '''
+        Tree builder for lxml, which feeds the chunks of a body into lxml's incremental parser as soon as
+        they arrive, instead of parsing the markup passed to BeautifulSoup.
+        '''
+        def __init__(self, body, charset, **kwargs):
+            '''
+            Initializes a StreamingLXMLTreeBuilder instance.
+
+            :param body: Iterable of the chunks of the body.
+            :param charset: Charset of the body.
+            '''
+            super(StreamingLXMLTreeBuilder, self).__init__(**kwargs)
+            self.body = body
+            self.charset = charset
+
+        def feed(self, markup):
+            if self.body is None:
+                raise ParserRejectedMarkup('The body has already been consumed.')
+
+            body, self.body = self.body, None
+
+            try:
+                self.parser = self.parser_for(self.charset)
+                self.parser.feed(b'')
+                for chunk in body:
+                    self.parser.feed(chunk)
+                self.parser.close()
+            except (UnicodeDecodeError, LookupError, etree.ParserError) as error:
+                raise ParserRejectedMarkup(error)
+else:
+    StreamingLXMLTreeBuilder = None
+
+
+def fetch_document(url, headers=None, transport=None, parser=None, region=None, page=None, max_size=None,
+                   metrics=None, site=None):
+    '''
+    Requests a page with a compressed body and builds its BeautifulSoup object while the body is being downloaded.
+
+    The body is streamed in chunks into an incremental parser (html.parser or lxml), so that parsing starts with
+    the first chunk and the full body is never held in memory. The charset is taken from the Content-Type header,
+    else from a meta tag within the first kilobyte of the body, else UTF-8 is assumed. html5lib cannot parse
+    incrementally, so its body is downloaded the same way, but parsed after the download.
+
+    Returns a tuple of the response, whose body has been consumed, and the BeautifulSoup object. If the request
+    failed (status code other than 200), the response is closed and None is returned as document.
+
+    :param url: URL to perform the request on.
+    :param headers: Header of the request. Unless it specifies an Accept-Encoding, gzip, deflate and, if installed,
+    brotli are accepted.
+    :param transport: Transport to perform the request with. If none is specified, a new connection is opened.
+    :param parser: BeautifulSoup backend. If none is specified, the process-wide default parser will be used.
+    :param region: Tuple of tag name, attribute and attribute value(s). If specified, only the matching elements
+    and their descendants are parsed.
+    :param page: Type of the requested page, passed on to the transport and the metrics.
+    :param max_size: Maximum size of the decompressed body in bytes. If None, the size is not limited.
+    :param metrics: Optional Metrics of the metrics module, recording the request and the document build.
+    :param site: Name of the website, with which the request is recorded.
+
+    :raise RuntimeError: If the body exceeds the maximum size, a RuntimeError will be raised and the connection closed.
+    '''
+    headers = dict(headers) if headers else dict()
+    headers.setdefault('Accept-Encoding', ACCEPT_ENCODING)
+    start = time.perf_counter()
+
+    if transport:
+        response = transport.get(url, headers, page, stream=True)
+    else:
+        response = requests.get(url, headers=headers, stream=True)
+
+    if response.status_code != 200:
+        if metrics:
+            metrics.record_request(site, page, response.status_code, time.perf_counter() - start, len(response.content))
+        response.close()
+        return response, None
+
+    length = response.headers.get('Content-Length')
+    if max_size and length and length.isdigit() and int(length) > max_size:
+        response.close()
+        raise RuntimeError(f'The body of {url} exceeds the maximum size of {max_size} bytes.')
+
+    latency = time.perf_counter() - start
+    body = Body(response, max_size)
+
+    try:
+        charset = get_charset(response.headers, body.prescan())
+        waited = body.waiting
+        build_start = time.perf_counter()
+        document = build_document(body, charset, parser if parser else helper.default_parser, region)
+        build_time = time.perf_counter() - build_start
+    finally:
+        response.close()
+
+    if metrics:
+        metrics.record_request(site, page, response.status_code, latency + body.waiting, body.size)
+        metrics.record_soup(site, page, parser, build_time - (body.waiting - waited))
+
+    return response, document
+
+
+def build_document(body, charset, parser, region=None):
+    '''
+    Returns the BeautifulSoup object of a body, which is parsed chunk by chunk while it is iterated.
+
+    :param body: Iterable of the chunks of the body.
+    :param charset: Charset of the body.
+    :param parser: BeautifulSoup backend.
+    :param region: Tuple of tag name, attribute and attribute value(s). If specified, only the matching elements
+    and their descendants are parsed.
+    '''
+    strainer = helper.get_strainer(region) if helper.get_region(region, parser) else None
+
+    if parser == 'html.parser':
+        return BeautifulSoup('', builder=StreamingHTMLParserTreeBuilder(body, charset), parse_only=strainer)
+    if parser == 'lxml' and StreamingLXMLTreeBuilder:
+        return BeautifulSoup('', builder=StreamingLXMLTreeBuilder(body, charset), parse_only=strainer)
+
+    return BeautifulSoup(b''.join(body), parser, parse_only=strainer, from_encoding=charset)
+
+
+def get_charset(headers, head):
+    '''
+    Returns the charset of a body, taken from the Content-Type header or, if it does not declare one, from a meta
+    tag within the head of the body. If neither declares a known charset, UTF-8 is returned.
+
+    :param headers: Headers of the response.
+    :param head: First bytes of the body.
+    '''
+    match = HEADER_CHARSET.search(headers.get('Content-Type', ''))
+    if not match:
+        match = META_CHARSET.search(head[:PRESCAN_SIZE])
+
+    if match:
+        charset = match.group(1)
+        charset = charset.decode('ascii') if isinstance(charset, bytes) else charset
+        try:
+            return codecs.lookup(charset).name
+        except LookupError:
+            pass
+
+    return DEFAULT_CHARSET
@@ -4,22 +4,93 @@ This module contains decorators and a parameter class for them.
 
 import re
 import itertools
-from bs4 import BeautifulSoup
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from helper import helper
+from websites import records
 
 
-def gameinfodecorator(page):
+def get_document(instance, page, markup, region=None):
+    '''
+    Returns the BeautifulSoup object for a markup, recording the time spent building it,
+    if the website model was created with metrics, and profiling it, if it was created with a profiler.
+
+    :param instance: Website model instance.
+    :param page: Type of the parsed page.
+    :param markup: Markup to be parsed.
+    :param region: Region of the page to be parsed. If none is specified, the full page is parsed.
+    '''
+    if instance.profiler:
+        return instance.profiler.call(build_document, instance, page, markup, region)
+
+    return build_document(instance, page, markup, region)
+
+
+def build_document(instance, page, markup, region=None):
+    '''
+    Returns the BeautifulSoup object for a markup, see get_document.
+    '''
+    if not instance.metrics:
+        return helper.get_document(markup, instance.parser, region)
+
+    start = time.perf_counter()
+    bs = helper.get_document(markup, instance.parser, region)
+    instance.metrics.record_soup(instance.site, page, instance.parser, time.perf_counter() - start)
+    return bs
+
+
+def parse(instance, parser, bs, page=None):
+    '''
+    Executes the parsing function on a document and converts its result into records of the records module,
+    if the website model was created with records set to true. The time spent in the parsing function is recorded,
+    if the website model was created with metrics, and profiled, if it was created with a profiler.
+
+    :param instance: Website model instance.
+    :param parser: Parsing function returned by the get-method.
+    :param bs: BeautifulSoup object to be parsed.
+    :param page: Type of the parsed page.
+    '''
+    if instance.profiler:
+        result = instance.profiler.call(execute, instance, parser, bs, page)
+    else:
+        result = execute(instance, parser, bs, page)
+
+    return records.from_result(parser, result) if instance.records else result
+
+
+def execute(instance, parser, bs, page=None):
+    '''
+    Executes the parsing function on a document and returns its result, see parse.
+    '''
+    if not instance.metrics:
+        return parser(bs)
+
+    start = time.perf_counter()
+    result = parser(bs)
+    instance.metrics.record_parse(instance.site, page, parser.__name__, time.perf_counter() - start)
+    return result
+
+
+def gameinfodecorator(page, region=None):
     '''
     Decorator to validate the request and perform data retrieval on the base and advanced info pages.
 
     The wrapper simply checks, if the request executed successfully (status code 200). If so, a BeautifulSoup
     instance for its response is created and the actual get-method executed. If not, an error is raised.
     If the request for the respective info page is None, it also raises an error.
+    The BeautifulSoup instance is cached in the documents dictionary of the instance, so that subsequent
+    get-methods on the same response do not parse the page again. If a region is specified, only this region
+    of the page is parsed, unless the full page has already been parsed for another get-method.
 
     :param page: Specifies, which request is to be used.
+    :param region: Region of the page needed by the get-method, as defined in the Parameters.Regions class.
+    If none is specified, the full page is parsed.
 
     :raise RuntimeError: If there is no request for the specified info page or the request failed, a RuntimeError will be raised.
     '''
+    label = re.sub(r'^response_', '', page)
+
     def get_infodecorator(func):
         def wrapper(*args):
             result = dict()
@@ -29,8 +100,18 @@ def gameinfodecorator(page):
                 raise RuntimeError(f'No response from the {page.lower()} info request received.')
 
             if response.status_code == 200:
-                bs = BeautifulSoup(response.text, 'html.parser')
-                result = func(*args)(bs)
+                document = args[0].documents.get(page)
+                if not document or document[0] is not response:
+                    document = (response, dict())
+                    args[0].documents[page] = document
+
+                trees = document[1]
+                parsed_region = helper.get_region(region, args[0].parser)
+                bs = trees[None] if None in trees else trees.get(parsed_region)
+                if bs is None:
+                    bs = get_document(args[0], label, response.text, parsed_region)
+                    trees[parsed_region] = bs
+                result = parse(args[0], func(*args), bs, label)
             else:
                 response.close()
                 raise RuntimeError(f'Cannot access {page.lower()} info page. The request failed with status code {response.status_code}')
@@ -45,6 +126,15 @@ def gamesearchdecorator(url):
     Decorator to perform the usual steps needed for searching a game, given the template of the
     website´s seearch page url.
 
+    If a read-ahead depth greater than zero is passed as keyword argument read_ahead, the next search pages
+    are requested and parsed in the background while the current one is consumed. At most read_ahead pages
+    beyond the current one are requested, and a further page is only requested after the current one contained games.
+    Pending requests are cancelled as soon as the generator is closed. The search ends at the first page without
+    further games.
+
+    If the website model was created with a search index, the search is answered from the index without any request.
+    Only if the index contains no matching game, the website is searched, and the found games are added to the index.
+
     :param url: The website´s template search page url.
 
     :raise RuntimeError: If the request for the search page fails, a RuntimeError will be raised, showing the status code
@@ -52,27 +142,73 @@ def gamesearchdecorator(url):
     '''
     def get_searchdecorator(func):
         def wrapper(*args, **kwargs):
-            for page in range(kwargs['max_pages']):
-                query = re.sub(r'\s', '+', kwargs['game'].strip())
-                search_url = url.format(args[0].url, query, page)
-                response = helper.get_response(search_url, args[0].headers)
+            instance = args[0]
+            if instance.index:
+                indexed = instance.index.search_pages(kwargs['game'], kwargs['max_pages'], instance.site)
+                if indexed:
+                    parser = func(*args, **kwargs)
+                    for search_result in indexed:
+                        yield records.from_result(parser, search_result) if instance.records else search_result
+                    return
 
-                if response.status_code == 200:
-                    bs = BeautifulSoup(response.text, 'html.parser')
+            query = re.sub(r'\s', '+', kwargs['game'].strip())
+            read_ahead = kwargs.get('read_ahead', 0)
+            pages = iter(range(kwargs['max_pages']))
 
-                    yield func(*args, **kwargs)(bs)
-                else:
-                    response.close()
+            def get_search_page(page):
+                search_url = url.format(args[0].url, query, page)
+                response, bs = args[0].request_document(search_url, 'search')
+
+                if bs is None:
                     raise RuntimeError(f'Search failed with status code {response.status_code}')
+
+                return bs
+
+            if read_ahead:
+                executor = ThreadPoolExecutor(max_workers=read_ahead + 1)
+                pending = deque(executor.submit(get_search_page, page)
+                                for page in itertools.islice(pages, read_ahead + 1))
+
+            try:
+                while True:
+                    if read_ahead:
+                        if not pending:
+                            return
+                        bs = pending.popleft().result()
+                    else:
+                        page = next(pages, None)
+                        if page is None:
+                            return
+                        bs = get_search_page(page)
+
+                    try:
+                        search_result = parse(args[0], func(*args, **kwargs), bs, 'search')
+                    except StopIteration:
+                        return
+
+                    if instance.index:
+                        instance.index.add_search_results(search_result, instance.site)
+
+                    yield search_result
+
+                    # The next page is only requested once the current one contained games and was consumed.
+                    if read_ahead:
+                        pending.extend(executor.submit(get_search_page, page) for page in itertools.islice(pages, 1))
+            finally:
+                if read_ahead:
+                    for future in pending:
+                        future.cancel()
+                    executor.shutdown(wait=False)
         return wrapper
     return get_searchdecorator
 
 
-def allgamesdecorator(console):
+def allgamesdecorator(console, region=None):
     '''
     Decorator to retrieve all games for a given console, including gamefaqs links.
 
     :param console: Platform, for which all games should be retrieved.
+    :param region: Region of the `all-games-page` to be parsed. If none is specified, the full page is parsed.
     :raise RuntimeError: If the request for the `all-games-page` fails, a RuntimeError will be raised,
     returning the error code of the failed request.
     :raise RuntimeError: If the games lst is empty, a RuntimeError will be raised, telling the user that 
@@ -85,12 +221,10 @@ def allgamesdecorator(console):
             for _ in itertools.repeat(None):
                 url = Parameters.GameFAQs.ALL_GAMES.format(
                     args[0].url, console, page)
-                response = helper.get_response(url, args[0].headers)
+                response, bs = args[0].request_document(url, 'all_games', region)
 
-                if response.status_code == 200:
-                    bs = BeautifulSoup(response.text, 'html.parser')
-                    
-                    found_games = func(*args)(bs)
+                if bs is not None:
+                    found_games = parse(args[0], func(*args), bs, 'all_games')
 
                     if len(found_games) == 0:
                         break
@@ -98,7 +232,148 @@ def allgamesdecorator(console):
                         games += found_games
                         page += 1
                 else:
-                    response.close()
+                    raise RuntimeError(f'Request failed with status code {response.status_code}.')
+            if len(games) == 0:
+                raise RuntimeError(f'No games for \'{console}\' found.')
+            return games
+        return wrapper
+    return get_allgamesdecorator
+
+def allgamesiteratordecorator(console, prefetch=4, region=None):
+    '''
+    Decorator to iterate over all games for a given console, including gamefaqs links, while the
+    `all-games-pages` are still being retrieved.
+
+    The next pages are requested and parsed in the background, at most prefetch pages ahead of the page
+    currently consumed. The iteration stops at the first page without any games, requests for pages beyond
+    it which are still pending are cancelled. If prefetch is zero, the pages are requested one after another
+    while they are consumed.
+
+    :param console: Platform, for which all games should be retrieved.
+    :param prefetch: Number of pages requested concurrently ahead of the consumer, zero for sequential paging.
+    :param region: Region of the `all-games-page` to be parsed. If none is specified, the full page is parsed.
+    :raise RuntimeError: If the request for an `all-games-page` fails, a RuntimeError will be raised,
+    returning the error code of the failed request.
+    '''
+    def get_allgamesiteratordecorator(func):
+        def wrapper(*args):
+            def get_games(page):
+                url = Parameters.GameFAQs.ALL_GAMES.format(
+                    args[0].url, console, page)
+                response, bs = args[0].request_document(url, 'all_games', region)
+
+                if bs is None:
+                    raise RuntimeError(f'Request failed with status code {response.status_code}.')
+
+                return parse(args[0], func(*args), bs, 'all_games')
+
+            if prefetch < 1:
+                for page in itertools.count():
+                    found_games = get_games(page)
+                    if len(found_games) == 0:
+                        return
+                    yield from found_games
+
+            executor = ThreadPoolExecutor(max_workers=prefetch)
+            pending = deque(executor.submit(get_games, page) for page in range(prefetch))
+            next_page = prefetch
+
+            try:
+                while pending:
+                    found_games = pending.popleft().result()
+
+                    if len(found_games) == 0:
+                        break
+
+                    pending.append(executor.submit(get_games, next_page))
+                    next_page += 1
+
+                    yield from found_games
+            finally:
+                for future in pending:
+                    future.cancel()
+                executor.shutdown(wait=False)
+        return wrapper
+    return get_allgamesiteratordecorator
+
+
+def asyncgameinfodecorator(page, region=None):
+    '''
+    Asynchronous counterpart of the gameinfodecorator. The responses have already been received by the
+    asynchronous gamesession, so the get-method is executed exactly like its synchronous counterpart.
+
+    :param page: Specifies, which request is to be used.
+    :param region: Region of the page needed by the get-method, as defined in the Parameters.Regions class.
+
+    :raise RuntimeError: If there is no request for the specified info page or the request failed, a RuntimeError will be raised.
+    '''
+    def get_infodecorator(func):
+        get_info = gameinfodecorator(page, region)(func)
+
+        async def wrapper(*args):
+            return get_info(*args)
+        return wrapper
+    return get_infodecorator
+
+
+def asyncgamesearchdecorator(url):
+    '''
+    Asynchronous counterpart of the gamesearchdecorator, turning the search into an asynchronous generator.
+
+    :param url: The website´s template search page url.
+
+    :raise RuntimeError: If the request for the search page fails, a RuntimeError will be raised, showing the status code
+    of the failed request.
+    '''
+    def get_searchdecorator(func):
+        async def wrapper(*args, **kwargs):
+            query = re.sub(r'\s', '+', kwargs['game'].strip())
+            for page in range(kwargs['max_pages']):
+                search_url = url.format(args[0].url, query, page)
+                response = await args[0].request(search_url, 'search')
+
+                if response.status_code == 200:
+                    bs = get_document(args[0], 'search', response.text)
+
+                    try:
+                        yield parse(args[0], func(*args, **kwargs), bs, 'search')
+                    except StopIteration:
+                        return
+                else:
+                    raise RuntimeError(f'Search failed with status code {response.status_code}')
+        return wrapper
+    return get_searchdecorator
+
+
+def asyncallgamesdecorator(console, region=None):
+    '''
+    Asynchronous counterpart of the allgamesdecorator.
+
+    :param console: Platform, for which all games should be retrieved.
+    :param region: Region of the `all-games-page` to be parsed. If none is specified, the full page is parsed.
+    :raise RuntimeError: If the request for the `all-games-page` fails, a RuntimeError will be raised,
+    returning the error code of the failed request.
+    :raise RuntimeError: If the games list is empty, a RuntimeError will be raised, telling the user that
+    no games for the specified console were found.
+    '''
+    def get_allgamesdecorator(func):
+        async def wrapper(*args):
+            games = list()
+            page = 0
+            while True:
+                url = Parameters.GameFAQs.ALL_GAMES.format(
+                    args[0].url, console, page)
+                response = await args[0].request(url, 'all_games')
+
+                if response.status_code == 200:
+                    bs = get_document(args[0], 'all_games', response.text, region)
+                    found_games = parse(args[0], func(*args), bs, 'all_games')
+
+                    if len(found_games) == 0:
+                        break
+                    games += found_games
+                    page += 1
+                else:
                     raise RuntimeError(f'Request failed with status code {response.status_code}.')
             if len(games) == 0:
                 raise RuntimeError(f'No games for \'{console}\' found.')
@@ -127,5 +402,22 @@ class Parameters:
         '''
         Parameter class for Gamerankings
         '''
-        OVERVIEW = 'response_overview'
-        SEARCH_URL = '{}/browse.html?search={}&numrev=3&page={}'
\ No newline at end of file
+        OVERVIEW = 'response_reviews'
+        SEARCH_URL = '{}/browse.html?search={}&numrev=3&page={}'
+
+    class Regions:
+        '''
+        Parameter class for the regions of a page, which are needed by a single get-method.
+        A region is described by a tag name, an attribute and the value(s) of this attribute.
+        '''
+        NAME = ('h1', 'class', 'page-title')
+        DESCRIPTION = ('div', 'class', 'desc')
+        USER_RATINGS = ('fieldset', 'class', 'mygames_section')
+        BASE_INFO = ('div', 'class', 'pod_gameinfo')
+        TITLE_DATA = ('div', 'class', 'pod_titledata')
+        VERSIONS = ('td', 'class', ('cregion', 'datacompany', 'datapid', 'cdate', 'datarating'))
+        DLC = ('div', 'id', 'dlc')
+        QUESTIONS = ('table', 'class', 'qna_table')
+        QUESTION_DETAILS = ('div', 'class', 'main_content')
+        ALL_GAMES = ('table', 'class', 'results')
+        REVIEWS = ('table', 'class', 'release')
\ No newline at end of file
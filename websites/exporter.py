@@ -0,0 +1,313 @@
+'''
+This module contains a streaming exporter, which writes crawled games, user ratings and reviews into
+columnar files, which can be memory-mapped by analytics jobs instead of parsing JSON again.
+
+Every table has a fixed schema. The rows are collected column by column and written as a batch as soon as
+batch_size rows have been collected, so the memory used does not grow with the number of exported games.
+The supported formats are Arrow IPC files and Parquet files, which require the package pyarrow, and NumPy
+structured arrays in .npy files, which only require the package numpy.
+'''
+
+import os
+import struct
+from websites import records
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import numpy
+    import numpy.lib.format
+except ImportError:
+    numpy = None
+
+
+FORMATS = {
+    'arrow': '.arrow',
+    'parquet': '.parquet',
+    'npy': '.npy'}
+
+# Every column is described by its name, its type (str, int or float) and, for the .npy format,
+# the maximum number of characters of a string. Longer strings are truncated in .npy files only.
+GAMES = (
+    ('link', str, 128),
+    ('name', str, 128),
+    ('platform', str, 32),
+    ('also_on', str, 128),
+    ('company', str, 64),
+    ('release', str, 32),
+    ('genre', str, 64),
+    ('franchise', str, 64),
+    ('esrb', str, 8),
+    ('metacritic_score', int, None),
+    ('metacritic_reviews', int, None),
+    ('versions', int, None),
+    ('questions', int, None))
+
+USER_RATINGS = (
+    ('link', str, 128),
+    ('category', str, 16),
+    ('rating', str, 32),
+    ('votes', int, None))
+
+REVIEWS = (
+    ('link', str, 128),
+    ('site', str, 64),
+    ('date', str, 16),
+    ('review_link', str, 256),
+    ('site_rating', str, 16),
+    ('ratio', float, None))
+
+NPY_HEADER_SIZE = 1024
+
+
+class ColumnarWriter:
+    '''
+    Writer for a single table with a fixed schema.
+
+    In .npy files, missing integers are stored as -1 and missing numbers as NaN, in Arrow and Parquet files as null.
+    '''
+    def __init__(self, path, schema, batch_size=10000, format=None):
+        '''
+        Initializes a ColumnarWriter instance.
+
+        :param path: Path of the output file.
+        :param schema: Schema of the table, e.g. GAMES.
+        :param batch_size: Number of rows written at once.
+        :param format: Output format (arrow, parquet or npy). Defaults to arrow if pyarrow is installed, else npy.
+
+        :raise ValueError: If the format is not supported, a ValueError will be raised.
+        :raise ImportError: If neither pyarrow nor numpy is installed for the chosen format, an ImportError will be raised.
+        '''
+        format = get_format(format)
+
+        self.path = path
+        self.schema = schema
+        self.batch_size = batch_size
+        self.format = format
+        self.rows = 0
+        self.columns = {name: list() for name, _, _ in schema}
+
+        if format == 'npy':
+            self.dtype = numpy.dtype([
+                (name, f'U{width}' if kind is str else ('i8' if kind is int else 'f8'))
+                for name, kind, width in schema])
+            self.file = open(path, 'wb')
+            self.__write_npy_header()
+        else:
+            types = {str: pyarrow.string(), int: pyarrow.int64(), float: pyarrow.float64()}
+            self.arrow_schema = pyarrow.schema([(name, types[kind]) for name, kind, _ in schema])
+            if format == 'parquet':
+                self.writer = pyarrow.parquet.ParquetWriter(path, self.arrow_schema)
+            else:
+                self.writer = pyarrow.ipc.new_file(path, self.arrow_schema)
+
+    def write(self, row):
+        '''
+        Appends a row to the current batch and writes the batch, if it is full.
+
+        :param row: Dictionary mapping column names to values. Missing columns are stored as missing values.
+        '''
+        for name, _, _ in self.schema:
+            self.columns[name].append(row.get(name))
+
+        if len(self.columns[self.schema[0][0]]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        '''
+        Writes the current batch.
+        '''
+        count = len(self.columns[self.schema[0][0]])
+        if not count:
+            return
+
+        if self.format == 'npy':
+            batch = numpy.empty(count, dtype=self.dtype)
+            for name, kind, _ in self.schema:
+                if kind is str:
+                    batch[name] = ['' if value is None else value for value in self.columns[name]]
+                elif kind is int:
+                    batch[name] = [-1 if value is None else value for value in self.columns[name]]
+                else:
+                    batch[name] = [numpy.nan if value is None else value for value in self.columns[name]]
+            self.file.write(batch.tobytes())
+        else:
+            self.writer.write_table(pyarrow.Table.from_pydict(self.columns, schema=self.arrow_schema))
+
+        self.rows += count
+        self.columns = {name: list() for name, _, _ in self.schema}
+
+    def close(self):
+        '''
+        Writes the last batch and closes the file.
+        '''
+        self.flush()
+
+        if self.format == 'npy':
+            self.file.seek(0)
+            self.__write_npy_header()
+            self.file.close()
+        else:
+            self.writer.close()
+
+    def __write_npy_header(self):
+        '''
+        Writes the .npy header for the rows written so far. The header is padded to a fixed size,
+        so that it can be rewritten with the final number of rows after all batches have been appended.
+        '''
+        header = repr({
+            'descr': numpy.lib.format.dtype_to_descr(self.dtype),
+            'fortran_order': False,
+            'shape': (self.rows,)}).encode('latin1')
+        prefix = b'\x93NUMPY\x02\x00'
+        padding = NPY_HEADER_SIZE - len(prefix) - 4 - len(header) - 1
+
+        if padding < 0:
+            raise ValueError('The schema is too large for the .npy header.')
+
+        self.file.write(prefix + struct.pack('<I', len(header) + padding + 1) + header + b' ' * padding + b'\n')
+
+
+class CatalogSink:
+    '''
+    Sink writing crawled games into the tables games and user_ratings of an output directory,
+    which can be passed to a Crawler. Reviews of gamerankings can be added to the table reviews.
+    '''
+    def __init__(self, directory, batch_size=10000, format=None):
+        '''
+        Initializes a CatalogSink instance.
+
+        :param directory: Output directory, which is created if it does not exist.
+        :param batch_size: Number of rows written at once per table.
+        :param format: Output format (arrow, parquet or npy). Defaults to arrow if pyarrow is installed, else npy.
+        '''
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.batch_size = batch_size
+        self.format = get_format(format)
+        self.games = self.__writer('games', GAMES)
+        self.user_ratings = self.__writer('user_ratings', USER_RATINGS)
+        self.reviews = None
+
+    def __call__(self, result):
+        '''
+        Writes a crawled game and its user ratings. Failed games are skipped.
+
+        :param result: Dictionary with the keys Link and Info, and optionally Questions, as passed by the Crawler.
+        '''
+        if 'Error' in result:
+            return
+
+        link = result['Link']
+        base_info = result['Info'].get('Base-Info', dict())
+        advanced_info = records.to_dict(result['Info'].get('Advanced-Info', dict()))
+        metacritic = base_info.get('Metacritic', dict())
+
+        self.games.write({
+            'link': link,
+            'name': base_info.get('Name'),
+            'platform': base_info.get('Core-Platform'),
+            'also_on': join(base_info.get('Also-on')),
+            'company': join(base_info.get('Company')),
+            'release': base_info.get('Release'),
+            'genre': join(advanced_info.get('Title-Data', dict()).get('Genre')),
+            'franchise': join(base_info.get('Franchise')),
+            'esrb': base_info.get('ESRB', dict()).get('Rating'),
+            'metacritic_score': metacritic.get('Score'),
+            'metacritic_reviews': metacritic.get('Reviews'),
+            'versions': len(advanced_info['Versions']) if 'Versions' in advanced_info else None,
+            'questions': count_questions(result['Questions']) if 'Questions' in result else None})
+
+        for category, rating in base_info.get('User-Ratings', dict()).items():
+            votes = records.to_int(rating['Votes'])
+            value = rating['Rating']
+            if rating['Votes'] and value.endswith(rating['Votes']):
+                value = value[:-len(rating['Votes'])]
+
+            self.user_ratings.write({
+                'link': link,
+                'category': category,
+                'rating': value.strip(),
+                'votes': votes})
+
+    def write_reviews(self, link, reviews):
+        '''
+        Writes the reviews of a game, as returned by Gamerankings.get_reviews.
+
+        :param link: Link of the game.
+        :param reviews: List of reviews, either as dictionaries or as records.
+        '''
+        if not self.reviews:
+            self.reviews = self.__writer('reviews', REVIEWS)
+
+        for review in records.to_dict(reviews):
+            self.reviews.write({
+                'link': link,
+                'site': review['Site'],
+                'date': review['Date'],
+                'review_link': review['Link'],
+                'site_rating': review['Site-Rating'],
+                'ratio': records.to_float(review['Ratio'])})
+
+    def close(self):
+        '''
+        Writes the last batches and closes all tables.
+        '''
+        for writer in (self.games, self.user_ratings, self.reviews):
+            if writer:
+                writer.close()
+
+    def __writer(self, table, schema):
+        '''
+        Returns a ColumnarWriter for a table of the output directory.
+        '''
+        path = os.path.join(self.directory, table + FORMATS[self.format])
+        return ColumnarWriter(path, schema, self.batch_size, self.format)
+
+
+def get_format(format=None):
+    '''
+    Returns the given output format after checking that it is supported and its package is installed.
+    If no format is given, arrow is returned if pyarrow is installed, else npy.
+
+    :param format: Output format (arrow, parquet or npy).
+
+    :raise ValueError: If the format is not supported, a ValueError will be raised.
+    :raise ImportError: If the package required by the format is not installed, an ImportError will be raised.
+    '''
+    format = format if format else ('arrow' if pyarrow else 'npy')
+
+    if format not in FORMATS:
+        raise ValueError(f'Unsupported format \'{format}\'. Supported formats: {", ".join(FORMATS)}.')
+    if format == 'npy' and not numpy:
+        raise ImportError('The npy format requires the package numpy.')
+    if format != 'npy' and not pyarrow:
+        raise ImportError(f'The {format} format requires the package pyarrow.')
+
+    return format
+
+
+def join(value):
+    '''
+    Returns a list of values as comma-separated string, other values unchanged.
+
+    :param value: Value of the parsed game info.
+    '''
+    return ', '.join(value) if isinstance(value, list) else value
+
+
+def count_questions(questions):
+    '''
+    Returns the total number of answered and unresolved questions of a game.
+
+    :param questions: Questions as returned by GameFAQs.get_all_questions.
+    '''
+    return sum(len(topic['Questions'])
+               for topics in records.to_dict(questions).values()
+               for topic in topics)
@@ -1,5 +1,9 @@
 import websites.gamefaqs.gameparser
 import websites.gamefaqs.gamesearcher
 import websites.gamefaqs.model
+import websites.gamefaqs.asyncmodel
+import websites.gamefaqs.crawler
+import websites.gamefaqs.game
+import websites.gamefaqs.catalog
 
-__all__ = ['gameparser', 'gamesearcher', 'model']
\ No newline at end of file
+__all__ = ['gameparser', 'gamesearcher', 'model', 'asyncmodel', 'crawler', 'game', 'catalog']
\ No newline at end of file
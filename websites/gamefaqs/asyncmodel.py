@@ -0,0 +1,195 @@
+'''
+This model conatins the asynchronous implementation of the GameFAQs website model,
+including relevant methods to search a game and retrieve information about it.
+'''
+
+from websites.gamefaqs import gamesearcher, gameparser
+from websites.model import AsyncWebsite
+from websites import decorators
+
+
+class AsyncGameFAQs(AsyncWebsite):
+    '''
+    Class to connect to gamefaqs.com asynchronously and provide basic information about video games.
+    '''
+    def __init__(self, headers=None, transport=None, parser=None, records=False, metrics=None, profile=None):
+        '''
+        Initializes an AsyncGameFAQs instance.
+
+        :param headers: Requests headers. If none is provided, the standard headers will be used, causing a 403.
+        :param transport: AsyncTransport, which can be shared between several instances.
+        :param parser: BeautifulSoup backend (html.parser, lxml or html5lib), defaults to the process-wide default.
+        :param records: If true, results are returned as compact records of the records module instead of dictionaries.
+        :param metrics: Optional Metrics of the metrics module, which can be shared between several instances.
+        :param profile: If true or a Profiler of the profiler module, requests and parsing are profiled.
+        If None, the environment variable COMPLETEWASTEOFTIME_PROFILE decides.
+        '''
+        super(AsyncGameFAQs, self).__init__(
+            headers=headers, transport=transport, parser=parser, records=records, metrics=metrics, profile=profile)
+        self.url = 'http://www.gamefaqs.com'
+        self.site = 'gamefaqs'
+        self.pages = {
+            'base': '/',
+            'advanced': '/data',
+            'questions_answered': '/answers/answered',
+            'questions_unresolved': '/answers/unresolved'
+            }
+
+    async def gamesession(self, path, base=True, advanced=True, questions_answered=False, questions_unresolved=False):
+        '''
+        Executes the requests for the base and advanced info pages concurrently and stores the responses
+        in instance variables.
+
+        :param base: If true, the request for the base info class will be executed, if false, not.
+        :param advanced: If true, the request for the advanced info class will be executed, if false, not.
+        '''
+        await super(AsyncGameFAQs, self).gamesession(
+            path,
+            base=base,
+            advanced=advanced,
+            questions_answered=questions_answered,
+            questions_unresolved=questions_unresolved)
+
+    async def close(self):
+        '''
+        Closes all open requests.
+        '''
+        await super(AsyncGameFAQs, self).close()
+
+    async def get_full_game_info(self):
+        '''
+        Returns both base and advanced info on the game.
+        '''
+        result = dict()
+
+        result['Base-Info'] = await self.get_full_base_info()
+        result['Advanced-Info'] = await self.get_full_advanced_info()
+
+        return result
+
+    @decorators.asyncgameinfodecorator(decorators.Parameters.GameFAQs.BASE)
+    def get_full_base_info(self):
+        '''
+        Returns the full base info on the game.
+        '''
+        return gameparser.get_full_base_info
+
+    @decorators.asyncgameinfodecorator(decorators.Parameters.GameFAQs.ADVANCED)
+    def get_full_advanced_info(self):
+        '''
+        Returns the full advanced info on the game.
+        '''
+        return gameparser.get_advanced_info
+
+    @decorators.asyncgameinfodecorator(
+        decorators.Parameters.GameFAQs.BASE, decorators.Parameters.Regions.DESCRIPTION)
+    def get_description(self):
+        '''
+        Returns the description of the game.
+        '''
+        return gameparser.get_description
+
+    @decorators.asyncgameinfodecorator(
+        decorators.Parameters.GameFAQs.BASE, decorators.Parameters.Regions.BASE_INFO)
+    def get_base_info(self):
+        '''
+        Returns platforms, developer, release date of the game
+        and franchise, ESRB rating and Metacritc score if available.
+        '''
+        return gameparser.get_base_info
+
+    @decorators.asyncgameinfodecorator(
+        decorators.Parameters.GameFAQs.BASE, decorators.Parameters.Regions.USER_RATINGS)
+    def get_user_ratings(self):
+        '''
+        Returns user statistic of the game: owned, rating, difficulty, length, completed.
+        '''
+        return gameparser.get_user_ratings
+
+    @decorators.asyncgameinfodecorator(
+        decorators.Parameters.GameFAQs.ADVANCED, decorators.Parameters.Regions.TITLE_DATA)
+    def get_title_info(self):
+        '''
+        Returns title info of the game, may vary.
+        '''
+        return gameparser.get_title_data
+
+    @decorators.asyncgameinfodecorator(
+        decorators.Parameters.GameFAQs.ADVANCED, decorators.Parameters.Regions.VERSIONS)
+    def get_versions(self):
+        '''
+        Returns versions of the game, including region, publisher, product ID, barcode, release date, rating if provided.
+        '''
+        return gameparser.get_versions
+
+    @decorators.asyncgameinfodecorator(
+        decorators.Parameters.GameFAQs.ADVANCED, decorators.Parameters.Regions.DLC)
+    def get_dlc(self):
+        '''
+        Returns name and GameFAQs-link of all Add-Ons/DLCs
+        '''
+        return gameparser.get_dlc
+
+    @decorators.asyncgameinfodecorator(
+        decorators.Parameters.GameFAQs.QUESTIONS_ANSWERED, decorators.Parameters.Regions.QUESTIONS)
+    def get_answered_questions(self):
+        '''
+        Returns all answered questions sorted by topic, including link and answer count.
+        '''
+        return gameparser.get_questions
+
+    @decorators.asyncgameinfodecorator(
+        decorators.Parameters.GameFAQs.QUESTIONS_UNRESOLVED, decorators.Parameters.Regions.QUESTIONS)
+    def get_unresolved_questions(self):
+        '''
+        Returns all unresolved questions sorted by topic, including link and answer count.
+        '''
+        return gameparser.get_questions
+
+    async def get_all_questions(self):
+        '''
+        Returns all questions, both answered and unanswered ones.
+        '''
+        return {
+            'Answered': await self.get_answered_questions(),
+            'Unresolved': await self.get_unresolved_questions()}
+
+    async def get_answers(self, answer_link):
+        '''
+        Returns answers to a question given its link. The answers include their up- and downvotes.
+
+        :param answer_link: Link to the question´s details page.
+        '''
+        self.response_answers = await self.request(f'{self.url}{answer_link}', 'answers')
+        self.free_documents(decorators.Parameters.GameFAQs.ANSWERS)
+
+        @decorators.asyncgameinfodecorator(
+            decorators.Parameters.GameFAQs.ANSWERS, decorators.Parameters.Regions.QUESTION_DETAILS)
+        def __get_answers(self, instance):
+            return gameparser.get_question_details
+
+        return await __get_answers(self, self)
+
+    async def get_all_games(self, console):
+        '''
+        Returns all games, including gamefaqs link, for a given console.
+
+        :param console: The console, for which all games should be retrieved. Warning:
+        The console given must match the url-path on gamefaqs.com.
+        '''
+        @decorators.asyncallgamesdecorator(console, decorators.Parameters.Regions.ALL_GAMES)
+        def get_all_games(self):
+            return gameparser.get_all_games
+        return await get_all_games(self)
+
+    def search_game(self, game, max_pages=1):
+        '''
+        Searches a game on GameFAQs and returns an asynchronous generator with the next 20 search results.
+
+        :param game: String containing the name of the game to be searched.
+        :param max_pages: Number of maximum pages in the search result.
+        '''
+        @decorators.asyncgamesearchdecorator(decorators.Parameters.GameFAQs.SEARCH_URL)
+        def search(self, game, max_pages):
+            return gamesearcher.parse_search_results
+        return search(self, game=game, max_pages=max_pages)
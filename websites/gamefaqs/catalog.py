@@ -0,0 +1,335 @@
+'''
+This module contains the incremental synchronization of console catalogs, which requests and parses
+only the games whose pages changed since the last run and passes the changes to a sink.
+'''
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from helper import helper
+from websites.gamefaqs.model import GameFAQs
+from websites import records
+
+
+class FingerprintStore:
+    '''
+    SQLite-backed store of the synchronized games.
+
+    For every game, the store keeps its console and the fingerprint of its parsed info, and for every info page
+    of the game the ETag and Last-Modified header of its last response and the fingerprint of its body.
+    '''
+    def __init__(self, path):
+        '''
+        Initializes a FingerprintStore instance.
+
+        :param path: Path of the SQLite database file.
+        '''
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS games ('
+            'link TEXT PRIMARY KEY, console TEXT, fingerprint TEXT, synced REAL)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS games_console ON games (console)')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            'link TEXT, page TEXT, etag TEXT, last_modified TEXT, fingerprint TEXT, PRIMARY KEY (link, page))')
+        self.connection.commit()
+
+    def get(self, link):
+        '''
+        Returns the stored state of a game as a tuple of the fingerprint of its info and a dictionary
+        mapping its pages to tuples of ETag, Last-Modified and body fingerprint, or None if the game is unknown.
+
+        :param link: Link of the game.
+        '''
+        with self.lock:
+            row = self.connection.execute('SELECT fingerprint FROM games WHERE link = ?', (link,)).fetchone()
+            if not row:
+                return None
+            pages = self.connection.execute(
+                'SELECT page, etag, last_modified, fingerprint FROM pages WHERE link = ?', (link,)).fetchall()
+
+        return row[0], {page: (etag, last_modified, fingerprint) for page, etag, last_modified, fingerprint in pages}
+
+    def put(self, link, console, fingerprint, pages):
+        '''
+        Stores the state of a game, replacing its previous state.
+
+        :param link: Link of the game.
+        :param console: Console, in whose catalog the game is listed.
+        :param fingerprint: Fingerprint of the parsed info of the game.
+        :param pages: Dictionary mapping the pages of the game to tuples of ETag, Last-Modified and body fingerprint.
+        '''
+        with self.lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?)', (link, console, fingerprint, time.time()))
+            self.connection.execute('DELETE FROM pages WHERE link = ?', (link,))
+            self.connection.executemany(
+                'INSERT INTO pages VALUES (?, ?, ?, ?, ?)',
+                [(link, page) + tuple(state) for page, state in pages.items()])
+            self.connection.commit()
+
+    def delete(self, link):
+        '''
+        Deletes the state of a game.
+
+        :param link: Link of the game.
+        '''
+        with self.lock:
+            self.connection.execute('DELETE FROM games WHERE link = ?', (link,))
+            self.connection.execute('DELETE FROM pages WHERE link = ?', (link,))
+            self.connection.commit()
+
+    def links(self, console):
+        '''
+        Returns the set of links of all stored games of a console.
+
+        :param console: Console of the games.
+        '''
+        with self.lock:
+            return set(row[0] for row in self.connection.execute(
+                'SELECT link FROM games WHERE console = ?', (console,)))
+
+    def close(self):
+        '''
+        Closes the database connection.
+        '''
+        with self.lock:
+            self.connection.close()
+
+
+class CatalogSync:
+    '''
+    Incremental synchronization of the full game info of all games of the given consoles.
+
+    Instead of a full dump, only the changes since the last synchronization with the same store are passed
+    to the sink: added, changed and removed games. The info pages of every listed game are requested
+    conditionally with the ETag and Last-Modified header of their last response. If all of them are not modified,
+    or the fingerprints of their bodies did not change, the game is skipped without being parsed. Otherwise the
+    full game info (and the questions) is retrieved again and compared to the fingerprint of the stored info,
+    so that changes of the pages not affecting the info are not reported. Games, which are not listed anymore,
+    are reported as removed.
+
+    The transport should not have a response cache, as fresh cached pages would hide changes of the pages.
+    '''
+    def __init__(self, store, headers=None, transport=None, max_workers=8, parser=None, questions=False,
+                 progress=None, metrics=None):
+        '''
+        Initializes a CatalogSync instance.
+
+        :param store: FingerprintStore, or the path of its SQLite database file.
+        :param headers: Requests headers, containing the key User-Agent.
+        :param transport: Pooled transport shared by all workers. If none is provided, the synchronization creates
+        one with a connection pool large enough for all workers.
+        :param max_workers: Number of games processed concurrently.
+        :param parser: BeautifulSoup backend (html.parser, lxml or html5lib), defaults to the process-wide default.
+        :param questions: If true, the questions of the games are synchronized as well.
+        :param progress: Function called with the statistics of the synchronization after every processed game.
+        :param metrics: Optional Metrics of the metrics module, shared by all workers.
+        '''
+        self.owns_store = not isinstance(store, FingerprintStore)
+        self.store = FingerprintStore(store) if self.owns_store else store
+        self.headers = headers
+        self.owns_transport = transport is None
+        self.transport = transport if transport else helper.Transport(pool_maxsize=max_workers * 4)
+        self.max_workers = max_workers
+        self.parser = parser
+        self.questions = questions
+        self.progress = progress
+        self.metrics = metrics
+        self.local = threading.local()
+        self.counters = dict.fromkeys(('Added', 'Changed', 'Removed', 'Unchanged', 'Failed', 'Not-Modified'), 0)
+        self.start = None
+
+    def sync(self, sink, consoles):
+        '''
+        Synchronizes all games of the given consoles and passes the changes to the sink.
+        Returns the statistics of the synchronization. The instance can synchronize repeatedly until it is closed.
+
+        Every change is a dictionary with the keys Change (Added, Changed or Removed), Console and Link, added
+        and changed games also have the key Info, containing the full game info, and Questions if questions are
+        synchronized. If a game could not be processed, the dictionary has the keys Console, Link and Error instead,
+        and the game is retried by the next synchronization.
+
+        :param sink: Function receiving every change, e.g. a JsonLinesSink of the crawler module.
+        :param consoles: List of consoles, whose games are synchronized. See GameFAQs.get_all_games.
+        '''
+        self.counters = dict.fromkeys(self.counters, 0)
+        self.start = time.perf_counter()
+
+        listing = GameFAQs(
+            headers=self.headers, transport=self.transport, parser=self.parser, metrics=self.metrics,
+            profile=False)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for console in consoles:
+                try:
+                    links = [game['Link'] for game in records.to_dict(listing.get_all_games(console))]
+                except RuntimeError as error:
+                    self.counters['Failed'] += 1
+                    sink({
+                        'Console': console,
+                        'Error': str(error)})
+                    continue
+
+                pending = set()
+                for link in dict.fromkeys(links):
+                    pending.add(executor.submit(self.__sync_game, console, link))
+                    if len(pending) >= self.max_workers * 2:
+                        completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self.__process(completed, sink)
+                self.__process(wait(pending)[0], sink)
+
+                for link in self.store.links(console) - set(links):
+                    sink({
+                        'Change': 'Removed',
+                        'Console': console,
+                        'Link': link})
+                    self.store.delete(link)
+                    self.counters['Removed'] += 1
+
+        return self.stats()
+
+    def close(self):
+        '''
+        Closes the store and the transport, if they were created by this instance.
+        '''
+        if self.owns_transport:
+            self.transport.close()
+        if self.owns_store:
+            self.store.close()
+
+    def stats(self):
+        '''
+        Returns the number of added, changed, removed, unchanged and failed games, the number of pages
+        which were not modified, and the elapsed time.
+        '''
+        result = dict(self.counters)
+        result['Seconds'] = time.perf_counter() - self.start if self.start else 0.0
+        return result
+
+    def __sync_game(self, console, link):
+        '''
+        Synchronizes a single game with the GameFAQs instance of the current worker thread. Returns the console,
+        the link, the change or None if the game did not change, the state to be stored and the number of pages
+        which were not modified.
+        '''
+        if not hasattr(self.local, 'gamefaqs'):
+            self.local.gamefaqs = GameFAQs(
+                headers=self.headers, transport=self.transport, parser=self.parser, metrics=self.metrics,
+                profile=False)
+        gamefaqs = self.local.gamefaqs
+        pages = ['base', 'advanced'] + (['questions_answered', 'questions_unresolved'] if self.questions else [])
+        stored = self.store.get(link)
+        known = stored[1] if stored else dict()
+        responses = dict()
+
+        try:
+            responses = self.__request(gamefaqs, link, pages, known)
+            not_modified = [page for page, response in responses.items() if response.status_code == 304]
+            states = dict()
+
+            for page, response in responses.items():
+                if page in not_modified:
+                    states[page] = known[page]
+                elif response.status_code == 200:
+                    states[page] = (
+                        response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                        get_fingerprint(response.content))
+                else:
+                    raise RuntimeError(
+                        f'Cannot access {page} info page. The request failed with status code {response.status_code}')
+
+            if stored and all(page in known and states[page][2] == known[page][2] for page in pages):
+                return console, link, None, (stored[0], states), len(not_modified)
+
+            if not_modified:
+                for page, response in self.__request(gamefaqs, link, not_modified, dict()).items():
+                    responses[page].close()
+                    responses[page] = response
+                    if response.status_code != 200:
+                        raise RuntimeError(
+                            f'Cannot access {page} info page. The request failed with status code {response.status_code}')
+
+            gamefaqs.free_documents()
+            for page in pages:
+                setattr(gamefaqs, f'response_{page}', responses[page])
+
+            result = {'Info': gamefaqs.get_full_game_info()}
+            if self.questions:
+                result['Questions'] = gamefaqs.get_all_questions()
+            result = records.to_dict(result)
+            fingerprint = get_fingerprint(json.dumps(result, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+
+            if stored and stored[0] == fingerprint:
+                return console, link, None, (fingerprint, states), len(not_modified)
+
+            change = dict({
+                'Change': 'Changed' if stored else 'Added',
+                'Console': console,
+                'Link': link}, **result)
+            return console, link, change, (fingerprint, states), len(not_modified)
+        except Exception as error:
+            return console, link, {
+                'Console': console,
+                'Link': link,
+                'Error': str(error)}, None, 0
+        finally:
+            gamefaqs.free_documents()
+            for page in pages:
+                setattr(gamefaqs, f'response_{page}', None)
+            for response in responses.values():
+                response.close()
+
+    def __request(self, gamefaqs, link, pages, known):
+        '''
+        Requests the given pages of a game concurrently, conditionally if their ETag or Last-Modified header
+        is known. Returns a dictionary mapping the pages to their responses.
+        '''
+        def request(page):
+            headers = dict(self.headers) if self.headers else dict()
+            etag, last_modified, _ = known.get(page, (None, None, None))
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+            return helper.get_response(
+                f'{gamefaqs.url}{link}{gamefaqs.pages[page]}', headers, self.transport, page, self.metrics, gamefaqs.site)
+
+        with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            futures = {page: executor.submit(request, page) for page in pages}
+
+        return {page: future.result() for page, future in futures.items()}
+
+    def __process(self, completed, sink):
+        '''
+        Passes the changes of the completed games to the sink and stores their new state afterwards.
+        '''
+        for future in completed:
+            console, link, change, state, not_modified = future.result()
+            self.counters['Not-Modified'] += not_modified
+
+            if change:
+                sink(change)
+
+            if change and 'Error' in change:
+                self.counters['Failed'] += 1
+            else:
+                self.store.put(link, console, *state)
+                self.counters[change['Change'] if change else 'Unchanged'] += 1
+
+            if self.progress:
+                self.progress(self.stats())
+
+
+def get_fingerprint(content):
+    '''
+    Returns the fingerprint of a page body or of a parsed result.
+
+    :param content: Bytes to be fingerprinted.
+    '''
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
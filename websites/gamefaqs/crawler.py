@@ -0,0 +1,316 @@
+'''
+This module contains a crawler retrieving the full info of many games on gamefaqs
+concurrently, with checkpoints to resume interrupted runs.
+'''
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from helper import helper, profiler
+from websites.decorators import Parameters
+from websites.gamefaqs import gameparser
+from websites.gamefaqs.model import GameFAQs
+
+
+# Parsing functions and regions applied to the info pages by the parse workers, matching the get-methods
+# used by the crawler.
+PAGE_PARSERS = {
+    'base': (gameparser.get_full_base_info, None),
+    'advanced': (gameparser.get_advanced_info, None),
+    'questions_answered': (gameparser.get_questions, Parameters.Regions.QUESTIONS),
+    'questions_unresolved': (gameparser.get_questions, Parameters.Regions.QUESTIONS)}
+
+
+class JsonLinesSink:
+    '''
+    Sink writing every crawled game as a single JSON line to a file.
+    '''
+    def __init__(self, path):
+        '''
+        Initializes a JsonLinesSink instance. Existing files are appended to, so that resumed crawls
+        continue the output of the interrupted one.
+
+        :param path: Path of the output file.
+        '''
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def __call__(self, result):
+        '''
+        Writes a crawled game to the file.
+
+        :param result: Dictionary containing the crawled game.
+        '''
+        self.file.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        '''
+        Closes the output file.
+        '''
+        self.file.close()
+
+
+class Crawler:
+    '''
+    Crawler retrieving the full game info for all games of the given consoles or for a list of links.
+
+    The games are processed by a pool of worker threads, each one using its own GameFAQs instance, while
+    all of them share one pooled transport. The results are passed to the sink in the order they complete.
+    Every successfully processed link is appended to the checkpoint file afterwards, so that an interrupted crawl
+    with the same checkpoint skips all links already passed to the sink, while failed links are retried.
+
+    Building the BeautifulSoup documents and parsing them is CPU-bound and holds the GIL, so with many worker
+    threads the crawl is soon limited by a single core. With parse_workers, the worker threads only request
+    the pages and send their bodies to a pool of parse worker processes, which build the documents, parse them
+    and return the results, so that parsing scales with the number of cores.
+    '''
+    def __init__(self, headers=None, transport=None, max_workers=8, checkpoint=None, parser=None,
+                 questions=False, progress=None, metrics=None, profile=None, parse_workers=None):
+        '''
+        Initializes a Crawler instance.
+
+        :param headers: Requests headers, containing the key User-Agent.
+        :param transport: Pooled transport shared by all workers. If none is provided, the crawler creates one
+        with a connection pool large enough for all workers.
+        :param max_workers: Number of games processed concurrently.
+        :param checkpoint: Path of the checkpoint file. If none is provided, interrupted crawls cannot be resumed.
+        :param parser: BeautifulSoup backend (html.parser, lxml or html5lib), defaults to the process-wide default.
+        :param questions: If true, all questions of the games are retrieved as well.
+        :param progress: Function called with the statistics of the crawl after every processed game.
+        :param metrics: Optional Metrics of the metrics module, shared by all workers.
+        :param profile: If true or a Profiler of the profiler module, the requests and parsing of all workers are
+        profiled by a shared profiler. If None, the environment variable COMPLETEWASTEOFTIME_PROFILE decides.
+        Pages parsed by parse worker processes are not profiled.
+        :param parse_workers: Number of parse worker processes. If None or 0, the pages are parsed by the worker
+        threads themselves. The processes are started by a forkserver or spawned, so the main module of the calling
+        script must be importable without side effects.
+        '''
+        self.headers = headers
+        self.owns_transport = transport is None
+        self.transport = transport if transport else helper.Transport(pool_maxsize=max_workers * 4)
+        self.max_workers = max_workers
+        self.checkpoint = checkpoint
+        self.parser = parser
+        self.parse_workers = parse_workers
+        self.parse_executor = None
+        self.questions = questions
+        self.progress = progress
+        self.metrics = metrics
+        self.owns_profiler = profile is True
+        self.profiler = profiler.get_profiler(profile)
+        self.local = threading.local()
+        self.crawled = 0
+        self.failed = 0
+        self.skipped = 0
+        self.start = None
+
+    def crawl(self, sink, consoles=None, links=None):
+        '''
+        Crawls all games of the given consoles and/or the given links and passes the results to the sink.
+        Returns the statistics of the crawl. The instance can crawl repeatedly, e.g. to resume from its checkpoint,
+        until it is closed.
+
+        Every result is a dictionary with the keys Link and Info, containing the full game info, and Questions
+        if questions are retrieved. If a game could not be processed, the dictionary has the keys Link and Error.
+
+        :param sink: Function receiving the result for every game, e.g. a JsonLinesSink.
+        :param consoles: List of consoles, whose games are crawled. See GameFAQs.get_all_games.
+        :param links: List of links to the base info pages of the games to be crawled.
+        '''
+        done = self.__load_checkpoint()
+        checkpoint = open(self.checkpoint, 'a', encoding='utf-8') if self.checkpoint else None
+        self.crawled = self.failed = self.skipped = 0
+        self.start = time.perf_counter()
+        # The parse workers are only started on the first submit from a worker thread. Forking them from
+        # the multi-threaded crawler could copy locks held by other threads, so they are started by a forkserver,
+        # or spawned where it is not available.
+        if self.parse_workers:
+            context = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self.parse_executor = ProcessPoolExecutor(
+                max_workers=self.parse_workers, mp_context=multiprocessing.get_context(context))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = set()
+
+                for link in self.__links(consoles, links):
+                    if link in done:
+                        self.skipped += 1
+                        continue
+                    done.add(link)
+
+                    pending.add(executor.submit(self.__crawl_game, link))
+                    if len(pending) >= self.max_workers * 2:
+                        completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self.__process(completed, sink, checkpoint)
+
+                self.__process(wait(pending)[0], sink, checkpoint)
+        finally:
+            if checkpoint:
+                checkpoint.close()
+            if self.parse_executor:
+                self.parse_executor.shutdown()
+                self.parse_executor = None
+            if self.owns_profiler:
+                self.profiler.dump()
+
+        return self.stats()
+
+    def close(self):
+        '''
+        Closes the transport, if it was created by this instance.
+        '''
+        if self.owns_transport:
+            self.transport.close()
+
+    def stats(self):
+        '''
+        Returns the number of crawled, failed and skipped games, the elapsed time and the throughput in games per second.
+        '''
+        seconds = time.perf_counter() - self.start if self.start else 0.0
+
+        return {
+            'Crawled': self.crawled,
+            'Failed': self.failed,
+            'Skipped': self.skipped,
+            'Seconds': seconds,
+            'Games/s': (self.crawled + self.failed) / seconds if seconds else 0.0}
+
+    def __links(self, consoles, links):
+        '''
+        Returns a generator yielding the given links and the links of all games of the given consoles.
+        '''
+        if links:
+            yield from links
+
+        if consoles:
+            gamefaqs = GameFAQs(
+                headers=self.headers, transport=self.transport, parser=self.parser, metrics=self.metrics,
+                profile=self.profiler or False)
+            for console in consoles:
+                for game in gamefaqs.iter_all_games(console):
+                    yield game['Link']
+
+    def __crawl_game(self, link):
+        '''
+        Retrieves the full info of a single game with the GameFAQs instance of the current worker thread.
+        '''
+        if not hasattr(self.local, 'gamefaqs'):
+            self.local.gamefaqs = GameFAQs(
+                headers=self.headers, transport=self.transport, parser=self.parser, metrics=self.metrics,
+                profile=self.profiler or False)
+        gamefaqs = self.local.gamefaqs
+
+        try:
+            gamefaqs.gamesession(
+                link, questions_answered=self.questions, questions_unresolved=self.questions)
+            if self.parse_executor:
+                return dict({'Link': link}, **self.__parse_remote(gamefaqs))
+            result = {
+                'Link': link,
+                'Info': gamefaqs.get_full_game_info()}
+            if self.questions:
+                result['Questions'] = gamefaqs.get_all_questions()
+        except Exception as error:
+            result = {
+                'Link': link,
+                'Error': str(error)}
+        finally:
+            gamefaqs.free_documents()
+
+        return result
+
+    def __parse_remote(self, gamefaqs):
+        '''
+        Sends the bodies of the requested info pages to a parse worker and returns the parsed info
+        (and questions). The parse times measured by the worker are recorded in the metrics.
+        '''
+        pages = dict()
+
+        for page in PAGE_PARSERS:
+            response = getattr(gamefaqs, f'response_{page}', None)
+            if response is None:
+                continue
+            if response.status_code != 200:
+                response.close()
+                raise RuntimeError(
+                    f'Cannot access response_{page} info page. The request failed with status code {response.status_code}')
+            pages[page] = (response.content, response.encoding)
+
+        result, timings = self.parse_executor.submit(
+            parse_pages, pages, self.parser if self.parser else helper.default_parser).result()
+
+        if self.metrics:
+            for page, parser_name, build_time, parse_time in timings:
+                self.metrics.record_soup(gamefaqs.site, page, gamefaqs.parser, build_time)
+                self.metrics.record_parse(gamefaqs.site, page, parser_name, parse_time)
+
+        return result
+
+    def __process(self, completed, sink, checkpoint):
+        '''
+        Passes the results of the completed games to the sink and records them in the checkpoint.
+        '''
+        for future in completed:
+            result = future.result()
+            sink(result)
+
+            if 'Error' in result:
+                self.failed += 1
+            else:
+                self.crawled += 1
+
+            if checkpoint and 'Error' not in result:
+                checkpoint.write(result['Link'] + '\n')
+                checkpoint.flush()
+
+            if self.progress:
+                self.progress(self.stats())
+
+    def __load_checkpoint(self):
+        '''
+        Returns the set of links already processed according to the checkpoint file.
+        '''
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return set()
+
+        with open(self.checkpoint, encoding='utf-8') as file:
+            return set(line.strip() for line in file if line.strip())
+
+
+def parse_pages(pages, parser):
+    '''
+    Builds the documents of the info pages of a game and parses them, as done by a parse worker process.
+    Returns a tuple of the result, containing the key Info and, if the questions pages are given, Questions,
+    and a list of tuples of page, parsing function name, document build time and parsing time.
+
+    :param pages: Dictionary mapping the info pages to tuples of body and encoding. If the encoding is None,
+    BeautifulSoup detects it.
+    :param parser: BeautifulSoup backend.
+    '''
+    parsed = dict()
+    timings = list()
+
+    for page, (content, encoding) in pages.items():
+        func, region = PAGE_PARSERS[page]
+        markup = str(content, encoding, errors='replace') if encoding else content
+
+        start = time.perf_counter()
+        bs = helper.get_document(markup, parser, region)
+        built = time.perf_counter()
+        parsed[page] = func(bs)
+        timings.append((page, func.__name__, built - start, time.perf_counter() - built))
+
+    result = {
+        'Info': {
+            'Base-Info': parsed['base'],
+            'Advanced-Info': parsed['advanced']}}
+    if 'questions_answered' in parsed:
+        result['Questions'] = {
+            'Answered': parsed['questions_answered'],
+            'Unresolved': parsed['questions_unresolved']}
+
+    return result, timings
@@ -0,0 +1,259 @@
+'''
+This module contains the lazy game handle of the GameFAQs website model, which requests and parses the info pages
+of a game only when their data is accessed for the first time.
+'''
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from helper import helper
+from websites.gamefaqs import gameparser
+from websites.decorators import Parameters
+from websites import decorators, records
+
+
+# Regions, to which the pages are restricted when they are streamed. Pages without a region are parsed completely,
+# as several properties need different regions of them.
+STREAM_REGIONS = {
+    'questions_answered': Parameters.Regions.QUESTIONS,
+    'questions_unresolved': Parameters.Regions.QUESTIONS}
+
+
+class Game:
+    '''
+    Handle for a single game on GameFAQs, returned by GameFAQs.game.
+
+    In contrast to a gamesession, no page is requested in advance. Every property requests the page backing it
+    on first access, parses it and keeps the result, so that subsequent accesses neither request nor parse
+    the page again. Properties needing several pages, e.g. full_info or questions, request the missing pages
+    concurrently. Thus only the pages the caller actually uses are ever downloaded.
+
+    The handle uses the transport, parser, records, metrics and profiler of its website model, but not its
+    responses, so many handles of the same model can be used at the same time, also from several threads.
+    If the website model streams, every page is parsed while it is being downloaded. As the body is not kept
+    for parsing further regions later, the base and advanced info pages are parsed completely, the questions
+    pages only in the region of the questions.
+    '''
+    def __init__(self, website, path):
+        '''
+        Initializes a Game instance.
+
+        :param website: GameFAQs instance, whose requests and settings are used.
+        :param path: Path to the game specific url, e.g. /ps4/691087-tales-of-berseria.
+        '''
+        self.website = website
+        self.path = path
+        self.responses = dict()
+        self.documents = dict()
+        self.results = dict()
+        self.lock = threading.RLock()
+
+    @property
+    def name(self):
+        '''
+        Title of the game.
+        '''
+        return self.parse('base', gameparser.get_name, Parameters.Regions.NAME)
+
+    @property
+    def description(self):
+        '''
+        Description of the game.
+        '''
+        return self.parse('base', gameparser.get_description, Parameters.Regions.DESCRIPTION)
+
+    @property
+    def base_info(self):
+        '''
+        Platforms, developer, release date of the game and franchise, ESRB rating and Metacritic score if available.
+        '''
+        return self.parse('base', gameparser.get_base_info, Parameters.Regions.BASE_INFO)
+
+    @property
+    def user_ratings(self):
+        '''
+        User statistic of the game: owned, rating, difficulty, length, completed.
+        '''
+        return self.parse('base', gameparser.get_user_ratings, Parameters.Regions.USER_RATINGS)
+
+    @property
+    def full_base_info(self):
+        '''
+        Full base info on the game, see GameFAQs.get_full_base_info.
+        '''
+        return self.parse('base', gameparser.get_full_base_info)
+
+    @property
+    def title_data(self):
+        '''
+        Title info of the game, may vary, see GameFAQs.get_title_info.
+        '''
+        return self.parse('advanced', gameparser.get_title_data, Parameters.Regions.TITLE_DATA)
+
+    @property
+    def versions(self):
+        '''
+        Versions of the game, including region, publisher, product ID, barcode, release date, rating if provided.
+        '''
+        return self.parse('advanced', gameparser.get_versions, Parameters.Regions.VERSIONS)
+
+    @property
+    def dlc(self):
+        '''
+        Name and GameFAQs-link of all Add-Ons/DLCs.
+        '''
+        return self.parse('advanced', gameparser.get_dlc, Parameters.Regions.DLC)
+
+    @property
+    def advanced_info(self):
+        '''
+        Full advanced info on the game, see GameFAQs.get_full_advanced_info.
+        '''
+        return self.parse('advanced', gameparser.get_advanced_info)
+
+    @property
+    def full_info(self):
+        '''
+        Both base and advanced info on the game. Both pages are requested concurrently.
+        '''
+        self.__prefetch(('base', gameparser.get_full_base_info), ('advanced', gameparser.get_advanced_info))
+
+        return {
+            'Base-Info': self.full_base_info,
+            'Advanced-Info': self.advanced_info}
+
+    @property
+    def answered_questions(self):
+        '''
+        All answered questions sorted by topic, including link and answer count.
+        '''
+        return self.parse('questions_answered', gameparser.get_questions, Parameters.Regions.QUESTIONS)
+
+    @property
+    def unresolved_questions(self):
+        '''
+        All unresolved questions sorted by topic, including link and answer count.
+        '''
+        return self.parse('questions_unresolved', gameparser.get_questions, Parameters.Regions.QUESTIONS)
+
+    @property
+    def questions(self):
+        '''
+        All questions, both answered and unresolved ones. Both pages are requested concurrently.
+        '''
+        self.__prefetch(
+            ('questions_answered', gameparser.get_questions), ('questions_unresolved', gameparser.get_questions))
+
+        return {
+            'Answered': self.answered_questions,
+            'Unresolved': self.unresolved_questions}
+
+    def get_all_answers(self, max_workers=None):
+        '''
+        Returns a generator yielding the answers to all questions of the game, see GameFAQs.get_answers_many.
+        The answers are not kept by the handle.
+
+        :param max_workers: Maximum number of concurrently requested pages. Defaults to the max_workers of the model.
+        '''
+        links = [question['Link']
+                 for topics in records.to_dict(self.questions).values()
+                 for topic in topics
+                 for question in topic['Questions']]
+
+        return self.website.get_answers_many(links, max_workers)
+
+    def fetch(self, *pages):
+        '''
+        Requests all given info pages, which have not been requested yet, concurrently.
+
+        :param pages: Names of the info pages, as defined in the pages dictionary of the website model.
+
+        :raise RuntimeError: If a request fails, a RuntimeError will be raised. Pages, which were retrieved
+        successfully, are kept nevertheless.
+        '''
+        with self.lock:
+            missing = [page for page in pages if page not in self.responses]
+
+            if len(missing) == 1:
+                responses = [self.__request(missing[0])]
+            elif missing:
+                with ThreadPoolExecutor(max_workers=min(self.website.max_workers, len(missing))) as executor:
+                    futures = [executor.submit(self.__request, page) for page in missing]
+                responses = [future.result() for future in futures]
+            else:
+                responses = list()
+
+            failed = None
+            for page, (response, bs) in zip(missing, responses):
+                if response.status_code == 200:
+                    self.responses[page] = response
+                    if bs is not None:
+                        self.documents[page] = {helper.get_region(STREAM_REGIONS.get(page), self.website.parser): bs}
+                else:
+                    response.close()
+                    failed = failed if failed else (
+                        f'Cannot access {page} info page. The request failed with status code {response.status_code}')
+
+            if failed:
+                raise RuntimeError(failed)
+
+    def parse(self, page, func, region=None):
+        '''
+        Returns the result of a parsing function on an info page, requesting and parsing the page if needed.
+        The result is kept for subsequent calls.
+
+        Like in the gamesessions of the website models, the document of a page is only built for the region
+        needed by the parsing function, unless the full page has already been parsed for another one.
+
+        :param page: Name of the info page, as defined in the pages dictionary of the website model.
+        :param func: Parsing function of the gameparser module.
+        :param region: Region of the page needed by the parsing function, as defined in the Parameters.Regions class.
+        If none is specified, the full page is parsed.
+
+        :raise RuntimeError: If the request for the page fails, a RuntimeError will be raised.
+        '''
+        with self.lock:
+            if (page, func) in self.results:
+                return self.results[(page, func)]
+
+            self.fetch(page)
+
+            trees = self.documents.setdefault(page, dict())
+            region = helper.get_region(region, self.website.parser)
+            bs = trees[None] if None in trees else trees.get(region)
+            if bs is None:
+                bs = decorators.get_document(self.website, page, self.responses[page].text, region)
+                trees[region] = bs
+
+            result = decorators.parse(self.website, func, bs, page)
+            self.results[(page, func)] = result
+
+            return result
+
+    def close(self):
+        '''
+        Closes all responses and frees the parsed documents. The results already accessed are kept.
+        '''
+        with self.lock:
+            for response in self.responses.values():
+                response.close()
+
+            self.responses.clear()
+            self.documents.clear()
+
+    def __prefetch(self, *parsers):
+        '''
+        Requests the pages of all given pairs of page and parsing function concurrently, whose results are not kept yet.
+        '''
+        self.fetch(*[page for page, func in parsers if (page, func) not in self.results])
+
+    def __request(self, page):
+        '''
+        Requests a single info page of the game and returns the response and, if the website model streams,
+        the document of the page.
+        '''
+        url = f'{self.website.url}{self.path}{self.website.pages[page]}'
+
+        if self.website.stream:
+            return self.website.request_document(url, page, STREAM_REGIONS.get(page))
+
+        return self.website.request(url, page), None
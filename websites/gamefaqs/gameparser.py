@@ -9,6 +9,15 @@ base/advance data page.
 import re
 
 
+WHITESPACE = re.compile(r'\s')
+BRACKETS = re.compile(r'[()]')
+SEPARATOR = re.compile(r' >')
+NUMBERS = re.compile(r'\d+')
+DLC_LINK = re.compile(r'#dlc')
+COMPANY_LINK = re.compile(r'/company/')
+VERSION_CLASSES = ('cregion', 'datacompany', 'datapid', 'cdate', 'datarating')
+
+
 def get_name(info_page):
     '''
     Returns the title of the game from both base and advanced info page.
@@ -42,8 +51,16 @@ def get_user_ratings(base_info_page):
 
     :param base_info_page: BeautifulSoup object containing the base info page.
     '''
+    return __parse_user_ratings(base_info_page.find_all('fieldset', class_='mygames_section'))
+
+
+def __parse_user_ratings(user_ratings_fieldsets):
+    '''
+    Returns the user ratings from the user rating fieldsets of the base info page, see get_user_ratings.
+
+    :param user_ratings_fieldsets: List of all fieldsets with the class mygames_section.
+    '''
     result = dict()
-    user_ratings_fieldsets = base_info_page.find_all('fieldset', class_='mygames_section')
 
     if user_ratings_fieldsets:
         categories = list()
@@ -89,9 +106,18 @@ def get_base_info(base_info_page):
 
     :param base_info_page: BeautifulSoup object containing the base info page
     '''
+    return __parse_base_info(base_info_page.find('div', class_='pod_gameinfo'))
+
+
+def __parse_base_info(base_info_pod):
+    '''
+    Returns the basic info on the game from the base info box of the base info page, see get_base_info.
+
+    :param base_info_pod: BeautifulSoup object containing the div-container with the class pod_gameinfo.
+    '''
     result = dict()
-    base_info = base_info_page.find('div', class_='pod_gameinfo').find('ul')
-        
+    base_info = base_info_pod.find('ul')
+
     if base_info:
         categories = list()
         values = list()
@@ -100,14 +126,15 @@ def get_base_info(base_info_page):
             if not 'class' in info.attrs:
                 contents = info.find('b')
                 if contents:
-                    category = re.sub(r'\s', '-', contents.text[:-1])
+                    category = WHITESPACE.sub('-', contents.text[:-1])
                     value = [val.text for val in info.find_all('a')]
                     if len(value) == 1:
                         value = value[0]
                 else:
-                    if re.search(r'#dlc', info.find('a')['href']):
+                    link = info.find('a')['href']
+                    if DLC_LINK.search(link):
                         category = 'DLC'
-                    elif re.search(r'/company/', info.find('a')['href']):
+                    elif COMPANY_LINK.search(link):
                         category = 'Company'
                     value = info.text
                 categories.append(category)
@@ -140,15 +167,39 @@ def get_full_base_info(base_info_page):
     Returns the full base info on the game provided on the base info page
     (base info, description, user ratings, name).
 
-    This method simply calls all available operations on the base info page
-    and stores the results in a dictionary.
+    Instead of calling all available operations on the base info page, each of them searching the
+    whole page again, the page is traversed once, collecting the title, the description, the user
+    rating fieldsets and the base info box at the same time. These are parsed exactly like by the single
+    operations, so the result is identical to calling get_base_info, get_description, get_user_ratings
+    and get_name one after another.
 
     :param base_info_page: BeautifulSoup object containing the base info page
     '''
-    result = get_base_info(base_info_page)
-    result['Description'] = get_description(base_info_page)
-    result['User-Ratings'] = get_user_ratings(base_info_page)
-    result['Name'] = get_name(base_info_page)
+    name = None
+    description = None
+    base_info_pod = None
+    user_ratings_fieldsets = list()
+
+    for tag in base_info_page.descendants:
+        if tag.name not in ('h1', 'div', 'fieldset'):
+            continue
+
+        classes = tag.get('class', ())
+        if tag.name == 'div':
+            if description is None and 'desc' in classes:
+                description = tag
+            if base_info_pod is None and 'pod_gameinfo' in classes:
+                base_info_pod = tag
+        elif tag.name == 'fieldset':
+            if 'mygames_section' in classes:
+                user_ratings_fieldsets.append(tag)
+        elif name is None and 'page-title' in classes:
+            name = tag
+
+    result = __parse_base_info(base_info_pod)
+    result['Description'] = description.text
+    result['User-Ratings'] = __parse_user_ratings(user_ratings_fieldsets)
+    result['Name'] = name.text
 
     return result
 
@@ -158,16 +209,32 @@ def get_advanced_info(advanced_info_page):
     Returns the full info on the game provided on the advanced info page.
     (title data, versions, add-ons)
 
-    This method simply calls all available perations on the advanced info page
-    and stores the results in a dictionary.
+    Instead of calling all available operations on the advanced info page, each of them searching the
+    whole page again (the versions even once per column), the page is traversed once, collecting the
+    title data container, the cells of the versions table and the DLC container at the same time.
+    The result is identical to calling get_title_data, get_versions and get_dlc one after another.
 
     :param advanced_info_page: BeautifulSoup object containing the advanced info page
     '''
     result = dict()
-    
-    result['Title-Data'] = get_title_data(advanced_info_page)
-    result['Versions'] = get_versions(advanced_info_page)
-    result['DLC'] = get_dlc(advanced_info_page)
+    title_data = None
+    dlcs = None
+    cells = {css_class: list() for css_class in VERSION_CLASSES}
+
+    for tag in advanced_info_page.descendants:
+        if tag.name == 'td':
+            for css_class in tag.get('class', ()):
+                if css_class in cells:
+                    cells[css_class].append(tag)
+        elif tag.name == 'div':
+            if title_data is None and 'pod_titledata' in tag.get('class', ()):
+                title_data = tag
+            if dlcs is None and tag.get('id') == 'dlc':
+                dlcs = tag
+
+    result['Title-Data'] = __parse_title_data(title_data)
+    result['Versions'] = __parse_versions(*cells.values())
+    result['DLC'] = __parse_dlc(dlcs)
 
     return result
 
@@ -188,16 +255,24 @@ def get_title_data(advanced_info_page):
 
     :param advanced_info_page: BeautifulSoup object containing the advanced info page
     '''
+    return __parse_title_data(advanced_info_page.find('div', 'pod_titledata'))
+
+
+def __parse_title_data(title_data):
+    '''
+    Returns the title data of the game from its container on the advanced info page, see get_title_data.
+
+    :param title_data: BeautifulSoup object containing the div-container with the class pod_titledata, or None.
+    '''
     result = dict()
-    title_data = advanced_info_page.find('div', 'pod_titledata')
 
     if title_data:
         categories = title_data.find_all('dt')
         values = title_data.find_all('dd')
 
         for category, value in zip(categories, values):
-            key = re.sub(r'\s', '-', re.sub(r'[()]', '', category.text))
-            value = re.sub(r' >', ',', value.text).split(',')
+            key = WHITESPACE.sub('-', BRACKETS.sub('', category.text))
+            value = SEPARATOR.sub(',', value.text).split(',')
             if len(value) > 1:
                 value = [val.strip() for val in value]
                     
@@ -219,15 +294,27 @@ def get_versions(advanced_info_page):
 
     :param advanced_info_page: BeautifulSoup object containing the advanced info page
     '''
-    result = list()
+    return __parse_versions(
+        advanced_info_page.find_all('td', class_='cregion'),
+        advanced_info_page.find_all('td', class_='datacompany'),
+        advanced_info_page.find_all('td', class_='datapid'),
+        advanced_info_page.find_all('td', class_='cdate'),
+        advanced_info_page.find_all('td', class_='datarating'))
+
+
+def __parse_versions(regions, publishers, ids, release_dates, ratings):
+    '''
+    Returns all published versions of the game from the cells of the versions table, see get_versions.
 
-    regions = advanced_info_page.find_all('td', class_='cregion')
-    publishers = advanced_info_page.find_all('td', class_='datacompany')
-    ids = advanced_info_page.find_all('td', class_='datapid')
+    :param regions: List of all cells with the class cregion.
+    :param publishers: List of all cells with the class datacompany.
+    :param ids: List of all cells with the class datapid, alternating product IDs and barcodes.
+    :param release_dates: List of all cells with the class cdate.
+    :param ratings: List of all cells with the class datarating.
+    '''
+    result = list()
     product_ids = ids[::2]
     barcodes = ids[1::2]
-    release_dates = advanced_info_page.find_all('td', class_='cdate')
-    ratings = advanced_info_page.find_all('td', class_='datarating')
 
     if regions and publishers and product_ids and barcodes and release_dates and ratings:
         for (region, publisher, product_id, barcode, release_date, rating) in zip(
@@ -253,8 +340,16 @@ def get_dlc(advance_info_page):
 
     :param advanced_info_page: BeautifulSoup object containing the advanced info page
     '''
+    return __parse_dlc(advance_info_page.find('div', id='dlc'))
+
+
+def __parse_dlc(dlcs):
+    '''
+    Returns all released add-ons/DLCs of the game from the DLC container, see get_dlc.
+
+    :param dlcs: BeautifulSoup object containing the div-container with the ID dlc, or None.
+    '''
     result = list()
-    dlcs = advance_info_page.find('div', id='dlc')
 
     if dlcs:
         for dlc in dlcs.find_all('a', href=True):
@@ -383,8 +478,7 @@ def __get_metacritic_score(base_info_pod):
         metacritic_reviews = metacritic.text
            
         try:
-            numbers = re.compile(r'\d+')
-            metacritic_review_count = int(numbers.findall(metacritic_reviews)[0])
+            metacritic_review_count = int(NUMBERS.findall(metacritic_reviews)[0])
         except IndexError:
             metacritic_review_count = None
 
@@ -4,24 +4,40 @@ including relevant methods to search a game and retrieve information about it.
 '''
 
 import re
-from helper import helper
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from websites.gamefaqs import gamesearcher, gameparser
+from websites.gamefaqs.game import Game
 from websites.model import Website
-from websites import decorators
+from websites import decorators, records
 
 
 class GameFAQs(Website):
     '''
     Class to connect to gamefaqs.com and provide basic information about video games.
     '''
-    def __init__(self, headers=None):
+    def __init__(self, headers=None, transport=None, max_workers=4, parser=None, records=False, metrics=None,
+                 profile=None, stream=False, max_body_size=None, index=None):
         '''
         Initializes a GameFAQs instance.
 
         :param headers: Requests headers. If none is provided, the standard headers will be used, causing a 403.
-        '''
-        super(GameFAQs, self).__init__(headers=headers)
+        :param transport: Pooled transport, which can be shared between several instances.
+        :param max_workers: Maximum number of info pages requested concurrently by gamesession.
+        :param parser: BeautifulSoup backend (html.parser, lxml or html5lib), defaults to the process-wide default.
+        :param records: If true, results are returned as compact records of the records module instead of dictionaries.
+        :param metrics: Optional Metrics of the metrics module, which can be shared between several instances.
+        :param profile: If true or a Profiler of the profiler module, requests and parsing are profiled.
+        If None, the environment variable COMPLETEWASTEOFTIME_PROFILE decides.
+        :param stream: If true, pages requested and parsed at once are parsed while being downloaded,
+        see the streaming module.
+        :param max_body_size: Maximum size of a streamed body in bytes. If None, the size is not limited.
+        :param index: Optional SearchIndex of the searchindex module, answering searches without requests.
+        '''
+        super(GameFAQs, self).__init__(
+            headers=headers, transport=transport, max_workers=max_workers, parser=parser, records=records,
+            metrics=metrics, profile=profile, stream=stream, max_body_size=max_body_size, index=index)
         self.url = 'http://www.gamefaqs.com'
+        self.site = 'gamefaqs'
         self.pages = {
             'base': '/',
             'advanced': '/data',
@@ -49,6 +65,16 @@ class GameFAQs(Website):
         '''
         super(GameFAQs, self).close()
 
+    def game(self, path):
+        '''
+        Returns a lazy handle for a game, whose properties (description, versions, dlc, user_ratings, questions, ...)
+        request and parse their info page on first access. Unlike gamesession, only the pages actually used
+        are requested, see the Game class.
+
+        :param path: Path to the game specific url.
+        '''
+        return Game(self, path)
+
     def get_full_game_info(self):
         '''
         Returns both base and advanced info on the game.
@@ -74,14 +100,16 @@ class GameFAQs(Website):
         '''
         return gameparser.get_advanced_info
 
-    @decorators.gameinfodecorator(decorators.Parameters.GameFAQs.BASE)
+    @decorators.gameinfodecorator(
+        decorators.Parameters.GameFAQs.BASE, decorators.Parameters.Regions.DESCRIPTION)
     def get_description(self):
         '''
         Returns the description of the game.
         '''
         return gameparser.get_description
 
-    @decorators.gameinfodecorator(decorators.Parameters.GameFAQs.BASE)
+    @decorators.gameinfodecorator(
+        decorators.Parameters.GameFAQs.BASE, decorators.Parameters.Regions.BASE_INFO)
     def get_base_info(self):
         '''
         Returns platforms, developer, release date of the game
@@ -89,14 +117,16 @@ class GameFAQs(Website):
         '''
         return gameparser.get_base_info
 
-    @decorators.gameinfodecorator(decorators.Parameters.GameFAQs.BASE)
+    @decorators.gameinfodecorator(
+        decorators.Parameters.GameFAQs.BASE, decorators.Parameters.Regions.USER_RATINGS)
     def get_user_ratings(self):
         '''
         Returns user statistic of the game: owned, rating, difficulty, length, completed.
         '''
         return gameparser.get_user_ratings
 
-    @decorators.gameinfodecorator(decorators.Parameters.GameFAQs.ADVANCED)
+    @decorators.gameinfodecorator(
+        decorators.Parameters.GameFAQs.ADVANCED, decorators.Parameters.Regions.TITLE_DATA)
     def get_title_info(self):
         '''
         Returns title info of the game, may vary.
@@ -104,30 +134,34 @@ class GameFAQs(Website):
         Examples: Tales of Berseria: genre, developer, multiplayer, Wiki
         The Sims: genre, developer, ESRB-descriptors, Wiki
         '''
-        return gameparser.get_title_info
+        return gameparser.get_title_data
 
-    @decorators.gameinfodecorator(decorators.Parameters.GameFAQs.ADVANCED)
+    @decorators.gameinfodecorator(
+        decorators.Parameters.GameFAQs.ADVANCED, decorators.Parameters.Regions.VERSIONS)
     def get_versions(self):
         '''
         Returns versions of the game, including region, publisher, product ID, barcode, release date, rating if provided.
         '''
         return gameparser.get_versions
 
-    @decorators.gameinfodecorator(decorators.Parameters.GameFAQs.ADVANCED)
+    @decorators.gameinfodecorator(
+        decorators.Parameters.GameFAQs.ADVANCED, decorators.Parameters.Regions.DLC)
     def get_dlc(self):
         '''
         Returns name and GameFAQs-link of all Add-Ons/DLCs
         '''
         return gameparser.get_dlc
 
-    @decorators.gameinfodecorator(decorators.Parameters.GameFAQs.QUESTIONS_ANSWERED)
+    @decorators.gameinfodecorator(
+        decorators.Parameters.GameFAQs.QUESTIONS_ANSWERED, decorators.Parameters.Regions.QUESTIONS)
     def get_answered_questions(self):
         '''
         Returns all answered questions sorted by topic, including link and answer count.
         '''
         return gameparser.get_questions
 
-    @decorators.gameinfodecorator(decorators.Parameters.GameFAQs.QUESTIONS_UNRESOLVED)
+    @decorators.gameinfodecorator(
+        decorators.Parameters.GameFAQs.QUESTIONS_UNRESOLVED, decorators.Parameters.Regions.QUESTIONS)
     def get_unresolved_questions(self):
         '''
         Returns all unresolved questions sorted by topic, including link and answer count.
@@ -148,15 +182,60 @@ class GameFAQs(Website):
         
         :param answer_link: Link to the question´s details page.
         '''
-        self.response_answers = helper.get_response(
-            f'{self.url}{answer_link}', self.headers)
+        self.response_answers = self.request(f'{self.url}{answer_link}', 'answers')
+        self.free_documents(decorators.Parameters.GameFAQs.ANSWERS)
 
-        @decorators.gameinfodecorator(decorators.Parameters.GameFAQs.ANSWERS)
+        @decorators.gameinfodecorator(
+            decorators.Parameters.GameFAQs.ANSWERS, decorators.Parameters.Regions.QUESTION_DETAILS)
         def __get_answers(self, instance):
             return gameparser.get_question_details
 
         return __get_answers(self, self)
 
+    def get_answers_many(self, answer_links, max_workers=None):
+        '''
+        Returns a generator yielding the answers to many questions, given their links, as soon as they are retrieved.
+        The question details pages are requested and parsed concurrently.
+
+        Every yielded item is a dictionary with the keys Link and Details, containing the full question text and
+        its answers as returned by get_answers. If a question could not be retrieved, the dictionary has the keys
+        Link and Error instead.
+
+        :param answer_links: Links to the questions´ details pages.
+        :param max_workers: Maximum number of concurrently requested pages. Defaults to the max_workers of the instance.
+        '''
+        with ThreadPoolExecutor(max_workers=max_workers if max_workers else self.max_workers) as executor:
+            futures = {executor.submit(self.__get_question_details, link): link for link in answer_links}
+
+            try:
+                for future in as_completed(futures):
+                    try:
+                        yield {
+                            'Link': futures[future],
+                            'Details': future.result()}
+                    except Exception as error:
+                        yield {
+                            'Link': futures[future],
+                            'Error': str(error)}
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def get_all_answers(self, max_workers=None):
+        '''
+        Returns a generator yielding the answers to all questions of the game, both answered and unresolved ones.
+        The gamesession must have been executed with questions_answered and questions_unresolved set to true.
+        See get_answers_many.
+
+        :param max_workers: Maximum number of concurrently requested pages. Defaults to the max_workers of the instance.
+        '''
+        links = [question['Link']
+                 for topics in records.to_dict(self.get_all_questions()).values()
+                 for topic in topics
+                 for question in topic['Questions']]
+
+        return self.get_answers_many(links, max_workers)
+
     def get_all_games(self, console):
         '''
         Returns all games, including gamefaqs link, for a given console.
@@ -166,12 +245,44 @@ class GameFAQs(Website):
         the Wii U should be returned, the parameter must have the value ´wii-u´, for the
         XBOX 360 it must equal ´xbox360´.
         '''
-        @decorators.allgamesdecorator(console)
+        @decorators.allgamesdecorator(console, decorators.Parameters.Regions.ALL_GAMES)
         def get_all_games(self):
             return gameparser.get_all_games
         return get_all_games(self)
 
-    def search_game(self, game, max_pages=1):
+    def iter_all_games(self, console, prefetch=4):
+        '''
+        Returns a generator yielding all games, including gamefaqs link, for a given console as soon as
+        their `all-games-page` has been retrieved. While the games of one page are consumed, the next pages
+        are already requested in the background.
+
+        :param console: The console, for which all games should be retrieved. It must match the url-path
+        on gamefaqs.com, see get_all_games.
+        :param prefetch: Number of pages requested concurrently ahead of the consumed page. If zero, the pages are
+        requested one after another.
+        '''
+        @decorators.allgamesiteratordecorator(console, prefetch, decorators.Parameters.Regions.ALL_GAMES)
+        def iter_all_games(self):
+            return gameparser.get_all_games
+        return iter_all_games(self)
+
+    def __get_question_details(self, answer_link):
+        '''
+        Requests and parses a single question details page without storing its response in the instance.
+
+        :param answer_link: Link to the question´s details page.
+
+        :raise RuntimeError: If the request fails, a RuntimeError will be raised.
+        '''
+        response, bs = self.request_document(
+            f'{self.url}{answer_link}', 'answers', decorators.Parameters.Regions.QUESTION_DETAILS)
+
+        if bs is None:
+            raise RuntimeError(f'Cannot access answers info page. The request failed with status code {response.status_code}')
+
+        return decorators.parse(self, gameparser.get_question_details, bs, 'answers')
+
+    def search_game(self, game, max_pages=1, read_ahead=0):
         '''
         Searches a game on GameFAQs and returns a generator with the next 20 search results.
         If None is found, the method gamesearcher.parse_search_results raises a StopIteration error,
@@ -179,9 +290,10 @@ class GameFAQs(Website):
 
         :param game: String containing the name of the game to be searched.
         :param max_pages: Number of maximum pages in the search result.
+        :param read_ahead: Number of search pages requested in the background ahead of the consumed one.
         '''
 
         @decorators.gamesearchdecorator(decorators.Parameters.GameFAQs.SEARCH_URL)
-        def search(self, game, max_pages):
+        def search(self, game, max_pages, read_ahead):
             return gamesearcher.parse_search_results
-        return search(self, game=game, max_pages=max_pages)
\ No newline at end of file
+        return search(self, game=game, max_pages=max_pages, read_ahead=read_ahead)
\ No newline at end of file
@@ -1,5 +1,6 @@
 import websites.gamerankings.reviewparser
 import websites.gamerankings.gamesearcher
 import websites.gamerankings.model
+import websites.gamerankings.asyncmodel
 
-__all__ = ['reviewparser', 'gamesearcher', 'model']
\ No newline at end of file
+__all__ = ['reviewparser', 'gamesearcher', 'model', 'asyncmodel']
\ No newline at end of file
@@ -0,0 +1,68 @@
+'''
+This model conatins the asynchronous implementation of the Gamerankings website model,
+including relevant methods to search a game and retrieve information about it.
+'''
+
+from websites.gamerankings import gamesearcher, reviewparser
+from websites.model import AsyncWebsite
+from websites import decorators
+
+
+class AsyncGamerankings(AsyncWebsite):
+    '''
+    Class to connect to gamerankings.com asynchronously and provide review information about video games.
+    '''
+    def __init__(self, headers=None, transport=None, parser=None, records=False, metrics=None, profile=None):
+        '''
+        Initializes an instance of an AsyncGamerankings object.
+
+        :param headers: Dictionary containing header information to be passed to the request.
+        :param transport: AsyncTransport, which can be shared between several instances.
+        :param parser: BeautifulSoup backend (html.parser, lxml or html5lib), defaults to the process-wide default.
+        :param records: If true, results are returned as compact records of the records module instead of dictionaries.
+        :param metrics: Optional Metrics of the metrics module, which can be shared between several instances.
+        :param profile: If true or a Profiler of the profiler module, requests and parsing are profiled.
+        If None, the environment variable COMPLETEWASTEOFTIME_PROFILE decides.
+        '''
+        super(AsyncGamerankings, self).__init__(
+            headers=headers, transport=transport, parser=parser, records=records, metrics=metrics, profile=profile)
+        self.url = 'http://www.gamerankings.com'
+        self.site = 'gamerankings'
+        self.pages = {
+            'reviews': '/articles.html'}
+
+    async def gamesession(self, path, reviews=True):
+        '''
+        Enables parsing the review page of a game by executing a request for its review page.
+
+        :param path: Path to the game specific base info page.
+        :param reviews: True, if the review page should be parsable, else false.
+        '''
+        await super(AsyncGamerankings, self).gamesession(path, reviews=reviews)
+
+    async def close(self):
+        '''
+        Closes all open requests.
+        '''
+        await super(AsyncGamerankings, self).close()
+
+    @decorators.asyncgameinfodecorator(
+        decorators.Parameters.Gamerankings.OVERVIEW, decorators.Parameters.Regions.REVIEWS)
+    def get_reviews(self):
+        '''
+        Returns the reviewing medium, the reviewer specific rating, a normalized rating
+        on the scale 0-100%, the date of the review and the link to the review if provided.
+        '''
+        return reviewparser.get_rankings
+
+    def search_game(self, game, max_pages=1):
+        '''
+        Returns an asynchronous generator providing the next 50 search results for a given search string.
+
+        :param game: Name of the game to be searched for.
+        :param max_pages: Maximum number of pages to be yielded by the generator.
+        '''
+        @decorators.asyncgamesearchdecorator(decorators.Parameters.Gamerankings.SEARCH_URL)
+        def search(self, game, max_pages):
+            return gamesearcher.parse_search_results
+        return search(self, game=game, max_pages=max_pages)
@@ -62,4 +62,4 @@ def parse_search_results(page):
                 'Rating': reviews.group(1),
                 'Reviews': reviews.group(2)})
 
-    return results
+    return result
@@ -15,14 +15,29 @@ class Gamerankings(Website):
     '''
     Class to connect to gamerankings.com and provide review information about video games.
     '''
-    def __init__(self, headers=None):
+    def __init__(self, headers=None, transport=None, max_workers=4, parser=None, records=False, metrics=None,
+                 profile=None, stream=False, max_body_size=None, index=None):
         '''
         Initializes an instance of a Gamerankings object.
 
         :param headers: Dictionary containing header information to be passed to the request.
+        :param transport: Pooled transport, which can be shared between several instances.
+        :param max_workers: Maximum number of info pages requested concurrently by gamesession.
+        :param parser: BeautifulSoup backend (html.parser, lxml or html5lib), defaults to the process-wide default.
+        :param records: If true, results are returned as compact records of the records module instead of dictionaries.
+        :param metrics: Optional Metrics of the metrics module, which can be shared between several instances.
+        :param profile: If true or a Profiler of the profiler module, requests and parsing are profiled.
+        If None, the environment variable COMPLETEWASTEOFTIME_PROFILE decides.
+        :param stream: If true, pages requested and parsed at once are parsed while being downloaded,
+        see the streaming module.
+        :param max_body_size: Maximum size of a streamed body in bytes. If None, the size is not limited.
+        :param index: Optional SearchIndex of the searchindex module, answering searches without requests.
         '''
-        super(Gamerankings, self).__init__(headers=headers)
+        super(Gamerankings, self).__init__(
+            headers=headers, transport=transport, max_workers=max_workers, parser=parser, records=records,
+            metrics=metrics, profile=profile, stream=stream, max_body_size=max_body_size, index=index)
         self.url = 'http://www.gamerankings.com'
+        self.site = 'gamerankings'
         self.pages = {
             'reviews': '/articles.html'}
         
@@ -41,7 +56,8 @@ class Gamerankings(Website):
         '''
         super(Gamerankings, self).close()
 
-    @decorators.gameinfodecorator(decorators.Parameters.Gamerankings.OVERVIEW)
+    @decorators.gameinfodecorator(
+        decorators.Parameters.Gamerankings.OVERVIEW, decorators.Parameters.Regions.REVIEWS)
     def get_reviews(self):
         '''
         Returns the reviewing medium, the reviewer specific rating, a normalized rating
@@ -49,14 +65,15 @@ class Gamerankings(Website):
         '''
         return reviewparser.get_rankings
 
-    def search_game(self, game, max_pages=1):
+    def search_game(self, game, max_pages=1, read_ahead=0):
         '''
         Returns a generator providing the next 50 search results for a given search string.
 
         :param game: Name of the game to be searched for.
         :param max_pages: Maximum number of pages to be yielded by the generator.
+        :param read_ahead: Number of search pages requested in the background ahead of the consumed one.
         '''
         @decorators.gamesearchdecorator(decorators.Parameters.Gamerankings.SEARCH_URL)
-        def search(self, game, max_pages):
+        def search(self, game, max_pages, read_ahead):
             return gamesearcher.parse_search_results
-        return search(self, game=game, max_pages=max_pages)
\ No newline at end of file
+        return search(self, game=game, max_pages=max_pages, read_ahead=read_ahead)
\ No newline at end of file
@@ -25,5 +25,5 @@ def get_rankings(page):
                     'Date': rows[1].text,
                     'Link': link['href'] if link else None,
                     'Site-Rating': link.text if link else rows[2].text,
-                    'Ratio': rows[3]})
+                    'Ratio': rows[3].text})
     return result
\ No newline at end of file
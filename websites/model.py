@@ -1,11 +1,14 @@
 '''
-This module conatins the abstract parent class for all website
-model classes, which contains skeleton implementations of the
-__init__, gamesession and close methods.
+This module conatins the abstract parent classes for all synchronous
+and asynchronous website model classes, which contain skeleton implementations
+of the __init__, gamesession and close methods.
 '''
 
+import asyncio
 from abc import ABC, abstractmethod
-from helper import helper
+from concurrent.futures import ThreadPoolExecutor
+from helper import helper, asynchelper, profiler, streaming
+from websites import decorators
 
 
 class Website(ABC):
@@ -13,13 +16,48 @@ class Website(ABC):
     Template class for implementing new gaming website models.
     '''
     @abstractmethod
-    def __init__(self, headers=None):
+    def __init__(self, headers=None, transport=None, max_workers=4, parser=None, records=False, metrics=None,
+                 profile=None, stream=False, max_body_size=None, index=None):
         '''
         Initializes an object of the Website class.
     
         :param headers: Dictionary, containing the key User-Agent.
+        :param transport: Pooled transport to perform the requests with. If none is provided, the instance
+        creates and owns its own transport, which is released by the close method.
+        :param max_workers: Maximum number of info pages requested concurrently by gamesession.
+        :param parser: BeautifulSoup backend (html.parser, lxml or html5lib). If none is provided,
+        the process-wide default parser of the helper module will be used.
+        :param records: If true, the get-methods return the compact record types of the records module
+        instead of dictionaries, where a record type is available.
+        :param metrics: Optional Metrics of the metrics module, which records request, document build and parsing
+        times of this instance. It can be shared between several instances.
+        :param profile: If true, a bounded window of requests, document builds and parsing function calls of this
+        instance is profiled, see the profiler module. A Profiler can also be passed, e.g. to share it between
+        several instances. If None, the environment variable COMPLETEWASTEOFTIME_PROFILE decides.
+        :param stream: If true, pages requested and parsed at once (search, all-games and answers pages, and the
+        pages of Game handles) are requested compressed and parsed while their body is being downloaded,
+        see the streaming module. The responses of a gamesession are always downloaded completely.
+        :param max_body_size: Maximum size of a streamed body in bytes. If None, the size is not limited.
+        :param index: Optional SearchIndex of the searchindex module. If provided, search_game answers from the index
+        and searches the website only if the index contains no matching game. It can be shared between several instances.
         '''
+        if parser and parser not in helper.PARSERS:
+            raise ValueError(f'Unsupported parser \'{parser}\'. Supported parsers: {", ".join(helper.PARSERS)}.')
+
         self.headers = headers
+        self.max_workers = max_workers
+        self.stream = stream
+        self.max_body_size = max_body_size
+        self.index = index
+        self.parser = parser
+        self.records = records
+        self.metrics = metrics
+        self.site = None
+        self.owns_profiler = profile is True
+        self.profiler = profiler.get_profiler(profile)
+        self.owns_transport = transport is None
+        self.transport = transport if transport else helper.Transport()
+        self.documents = dict()
 
 
     @abstractmethod
@@ -32,19 +70,200 @@ class Website(ABC):
         request is of the form {url of the website}{game specific path}{url of the info page, identical
         for all games}.
 
+        Pages, whose parameter is set to false, are not requested at all. The remaining pages are requested
+        concurrently by a pool of at most max_workers threads. If a request raises an exception, the responses
+        of all other requests are closed and the first exception is raised, leaving no page set up.
+
         :param path: Path to the game specific url.
         '''
-        for key, value in kwargs.items():
-            page = self.pages[key]
-            response = helper.get_response(f'{self.url}{path}{page}', self.headers)
-            setattr(self, f'response_{key}', response if value else None)
+        requested = [key for key, value in kwargs.items() if value]
+
+        for key in kwargs.keys():
+            setattr(self, f'response_{key}', None)
+            self.free_documents(f'response_{key}')
+
+        if not requested:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(requested))) as executor:
+            futures = {
+                key: executor.submit(self.request, f'{self.url}{path}{self.pages[key]}', key)
+                for key in requested}
+
+        errors = [future.exception() for future in futures.values() if future.exception()]
+        if errors:
+            # Release the connections of the successful requests, as the session is not set up.
+            for future in futures.values():
+                if not future.exception():
+                    future.result().close()
+            raise errors[0]
+
+        for key, future in futures.items():
+            setattr(self, f'response_{key}', future.result())
 
     @abstractmethod
     def close(self):
         '''
-        Closes all open requests.
+        Closes all open requests and releases the connection pool, if it is owned by this instance.
         '''
         for page in self.pages.keys():
-            response = getattr(self, f'response_{page}')
+            response = getattr(self, f'response_{page}', None)
             if response:
                 response.close()
+
+        self.free_documents()
+
+        if self.owns_transport:
+            self.transport.close()
+
+        if self.owns_profiler:
+            self.profiler.dump()
+
+    def request(self, url, page):
+        '''
+        Performs a request with the headers, transport and metrics of the instance and returns the response.
+        The request is profiled, if the instance has a profiler.
+
+        :param url: URL to perform the request on.
+        :param page: Type of the requested page (base, advanced, search, ...).
+        '''
+        if self.profiler:
+            return self.profiler.call(
+                helper.get_response, url, self.headers, self.transport, page, self.metrics, self.site)
+
+        return helper.get_response(url, self.headers, self.transport, page, self.metrics, self.site)
+
+    def request_document(self, url, page, region=None):
+        '''
+        Performs a request and returns the response together with the BeautifulSoup object of its body.
+        If the instance streams, the document is built while the body is being downloaded, else afterwards.
+        If the request failed (status code other than 200), the response is closed and None is returned
+        as document.
+
+        :param url: URL to perform the request on.
+        :param page: Type of the requested page (base, advanced, search, ...).
+        :param region: Region of the page to be parsed, as defined in the Parameters.Regions class
+        of the decorators module. If none is specified, the full page is parsed.
+
+        :raise RuntimeError: If a streamed body exceeds the maximum body size, a RuntimeError will be raised.
+        '''
+        if not self.stream:
+            response = self.request(url, page)
+            if response.status_code != 200:
+                response.close()
+                return response, None
+            return response, decorators.get_document(self, page, response.text, region)
+
+        arguments = (url, self.headers, self.transport, self.parser, region, page, self.max_body_size,
+                     self.metrics, self.site)
+        if self.profiler:
+            return self.profiler.call(streaming.fetch_document, *arguments)
+
+        return streaming.fetch_document(*arguments)
+
+    def free_documents(self, *pages):
+        '''
+        Frees the parsed documents cached for the responses of the specified info pages, including the
+        partially parsed regions of these pages. If no page is specified, all cached documents are freed.
+
+        :param pages: Names of the response attributes, e.g. response_base, whose documents are to be freed.
+        '''
+        if pages:
+            for page in pages:
+                self.documents.pop(page, None)
+        else:
+            self.documents.clear()
+
+    def stats(self):
+        '''
+        Returns the request, document build and parsing times recorded for this website, see Metrics.stats.
+        If the instance was created without metrics, None is returned.
+        '''
+        return self.metrics.stats(self.site) if self.metrics else None
+
+
+class AsyncWebsite(Website):
+    '''
+    Template class for implementing asynchronous gaming website models.
+
+    The responses of a gamesession are stored as instance variables just like in the synchronous models,
+    so a single instance handles one game at a time. Many instances sharing one AsyncTransport can be driven
+    concurrently by the same event loop.
+    '''
+    @abstractmethod
+    def __init__(self, headers=None, transport=None, parser=None, records=False, metrics=None, profile=None):
+        '''
+        Initializes an object of the AsyncWebsite class.
+
+        :param headers: Dictionary, containing the key User-Agent.
+        :param transport: AsyncTransport to perform the requests with. If none is provided, the instance
+        creates and owns its own transport, which is released by the close method.
+        :param parser: BeautifulSoup backend (html.parser, lxml or html5lib). If none is provided,
+        the process-wide default parser of the helper module will be used.
+        :param records: If true, the get-methods return the compact record types of the records module
+        instead of dictionaries, where a record type is available.
+        :param metrics: Optional Metrics of the metrics module, which records request, document build and parsing
+        times of this instance. It can be shared between several instances.
+        :param profile: If true, a bounded window of requests, document builds and parsing function calls of this
+        instance is profiled, see the profiler module. A Profiler can also be passed, e.g. to share it between
+        several instances. If None, the environment variable COMPLETEWASTEOFTIME_PROFILE decides.
+        '''
+        if parser and parser not in helper.PARSERS:
+            raise ValueError(f'Unsupported parser \'{parser}\'. Supported parsers: {", ".join(helper.PARSERS)}.')
+
+        self.headers = headers
+        self.parser = parser
+        self.records = records
+        self.metrics = metrics
+        self.site = None
+        self.owns_profiler = profile is True
+        self.profiler = profiler.get_profiler(profile)
+        self.owns_transport = transport is None
+        self.transport = transport if transport else asynchelper.AsyncTransport()
+        self.documents = dict()
+
+    @abstractmethod
+    async def gamesession(self, path, **kwargs):
+        '''
+        Sets up the responses for the specified info pages, analogous to the synchronous gamesession.
+        The requested pages are fetched concurrently.
+
+        :param path: Path to the game specific url.
+        '''
+        requested = [key for key, value in kwargs.items() if value]
+
+        for key in kwargs.keys():
+            setattr(self, f'response_{key}', None)
+            self.free_documents(f'response_{key}')
+
+        responses = await asyncio.gather(*[
+            self.request(f'{self.url}{path}{self.pages[key]}', key) for key in requested])
+
+        for key, response in zip(requested, responses):
+            setattr(self, f'response_{key}', response)
+
+    @abstractmethod
+    async def close(self):
+        '''
+        Frees all parsed documents and releases the connection pool, if it is owned by this instance.
+        '''
+        for page in self.pages.keys():
+            setattr(self, f'response_{page}', None)
+
+        self.free_documents()
+
+        if self.owns_transport:
+            await self.transport.close()
+
+        if self.owns_profiler:
+            self.profiler.dump()
+
+    async def request(self, url, page):
+        '''
+        Performs an asynchronous request with the headers, transport and metrics of the instance and returns
+        the response. Asynchronous requests are not profiled, as other tasks run while they are awaited.
+
+        :param url: URL to perform the request on.
+        :param page: Type of the requested page (base, advanced, search, ...).
+        '''
+        return await asynchelper.get_response(url, self.headers, self.transport, page, self.metrics, self.site)
@@ -0,0 +1,233 @@
+'''
+This module contains compact, immutable record types, which can be returned by the website models instead
+of the lists of dictionaries produced by the parsing functions.
+
+Every record is a named tuple without instance dictionary, so the field names are stored once per type
+instead of once per result. Numeric fields (years, counts, votes, ratings) are parsed into numbers once,
+when the record is created. Every record can be converted back into a dictionary with the keys of the parsing
+function by its to_dict method, or together with all nested records by the to_dict function. These dictionaries
+keep the parsed numbers, so they differ from those of the parsing functions in the types of these fields:
+Year, Reviews, Count, Upvotes and Downvotes are integers, Rating and Ratio are floats, and all of them are None
+where the parsing function returned a string without a number, e.g. cancelled or n\\a.
+'''
+
+import re
+from collections import namedtuple
+
+
+class Record:
+    '''
+    Mixin for the record types, providing the conversion from and to the dictionaries of the parsing functions.
+    KEYS holds the dictionary keys in the order of the fields.
+    '''
+    __slots__ = ()
+    KEYS = ()
+
+    @classmethod
+    def from_dict(cls, result):
+        '''
+        Creates a record from a dictionary returned by a parsing function.
+
+        :param result: Dictionary with the keys in KEYS.
+        '''
+        return cls(*(result.get(key) for key in cls.KEYS))
+
+    def to_dict(self):
+        '''
+        Returns the record as dictionary with the keys of the parsing function, converting nested records as well.
+        Numeric fields keep their parsed numbers instead of the strings of the parsing function.
+        '''
+        return {key: to_dict(value) for key, value in zip(self.KEYS, self)}
+
+
+class GameLink(Record, namedtuple('GameLink', ('name', 'link'))):
+    '''
+    Name and link of a game, console version or DLC.
+    '''
+    __slots__ = ()
+    KEYS = ('Name', 'Link')
+
+
+class SearchResult(Record, namedtuple('SearchResult', ('name', 'link', 'genre', 'company', 'year', 'consoles'))):
+    '''
+    Search result on gamefaqs. The year is None, if the game was cancelled.
+    '''
+    __slots__ = ()
+    KEYS = ('Name', 'Link', 'Genre', 'Company', 'Year', 'Consoles')
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(
+            result['Name'], result['Link'], result['Genre'], result['Company'], to_int(result['Year']),
+            tuple(GameLink.from_dict(console) for console in result['Consoles']))
+
+
+class RankingResult(Record, namedtuple(
+        'RankingResult', ('name', 'console', 'link', 'year', 'company', 'rating', 'reviews'))):
+    '''
+    Search result on gamerankings. The rating is the average in percent, None if not available.
+    '''
+    __slots__ = ()
+    KEYS = ('Name', 'Console', 'Link', 'Year', 'Company', 'Rating', 'Reviews')
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(
+            result['Name'], result['Console'], result['Link'], to_int(result['Year']), result['Company'],
+            to_float(result['Rating']), to_int(result['Reviews']))
+
+
+class Version(Record, namedtuple(
+        'Version', ('region', 'publisher', 'product_id', 'barcode', 'release_date', 'rating'))):
+    '''
+    Published version of a game.
+    '''
+    __slots__ = ()
+    KEYS = ('Region', 'Publisher', 'Product-Id', 'Barcode', 'Release-Date', 'Rating')
+
+
+class Question(Record, namedtuple('Question', ('question', 'link', 'count'))):
+    '''
+    Question on a game with its number of answers.
+    '''
+    __slots__ = ()
+    KEYS = ('Question', 'Link', 'Count')
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(result['Question'], result['Link'], to_int(result['Count']))
+
+
+class Topic(Record, namedtuple('Topic', ('topic', 'questions'))):
+    '''
+    Topic of the questions on a game, e.g. Enemy/Boss Help.
+    '''
+    __slots__ = ()
+    KEYS = ('Topic', 'Questions')
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(result['Topic'], tuple(Question.from_dict(question) for question in result['Questions']))
+
+
+class Answer(Record, namedtuple('Answer', ('answer', 'upvotes', 'downvotes'))):
+    '''
+    Answer to a question including its up- and downvotes.
+    '''
+    __slots__ = ()
+    KEYS = ('Answer', 'Upvotes', 'Downvotes')
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(result['Answer'], to_int(result['Upvotes']), to_int(result['Downvotes']))
+
+
+class QuestionDetails(Record, namedtuple('QuestionDetails', ('full_question', 'answers'))):
+    '''
+    Full text of a question and its answers.
+    '''
+    __slots__ = ()
+    KEYS = ('Full-Question', 'Answers')
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(result.get('Full-Question'), tuple(Answer.from_dict(answer) for answer in result.get('Answers', ())))
+
+
+class Review(Record, namedtuple('Review', ('site', 'date', 'link', 'site_rating', 'ratio'))):
+    '''
+    Critic review of a game. The ratio is the site specific rating scaled to percent.
+    '''
+    __slots__ = ()
+    KEYS = ('Site', 'Date', 'Link', 'Site-Rating', 'Ratio')
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(result['Site'], result['Date'], result['Link'], result['Site-Rating'], to_float(result['Ratio']))
+
+
+def to_int(value):
+    '''
+    Returns the first integer found in a string, e.g. 1998 for '1998' or 12 for '12 votes', or None if there is none.
+    Integers are returned unchanged.
+
+    :param value: String or integer to be parsed.
+    '''
+    if value is None or isinstance(value, int):
+        return value
+
+    match = re.search(r'\d[\d,]*', value)
+    return int(match.group().replace(',', '')) if match else None
+
+
+def to_float(value):
+    '''
+    Returns the first decimal number found in a string, e.g. 85.5 for '85.50%', or None if there is none.
+
+    :param value: String or number to be parsed.
+    '''
+    if value is None or isinstance(value, (int, float)):
+        return value
+
+    match = re.search(r'\d+(\.\d+)?', value)
+    return float(match.group()) if match else None
+
+
+def to_dict(result):
+    '''
+    Converts records, including records nested in lists, tuples and dictionaries, back into dictionaries.
+    Numeric fields keep their parsed numbers, see the module documentation.
+
+    :param result: Result of a get-method returning records.
+    '''
+    if isinstance(result, Record):
+        return result.to_dict()
+    if isinstance(result, (list, tuple)):
+        return [to_dict(value) for value in result]
+    if isinstance(result, dict):
+        return {key: to_dict(value) for key, value in result.items()}
+    return result
+
+
+def __advanced_info(result):
+    '''
+    Converts the versions and DLCs of the full advanced info, keeping the title data as dictionary.
+    '''
+    return dict(result,
+                Versions=[Version.from_dict(version) for version in result['Versions']],
+                DLC=[GameLink.from_dict(dlc) for dlc in result['DLC']])
+
+
+RECORDS = {
+    'websites.gamefaqs.gameparser.get_all_games': GameLink,
+    'websites.gamefaqs.gameparser.get_dlc': GameLink,
+    'websites.gamefaqs.gameparser.get_versions': Version,
+    'websites.gamefaqs.gameparser.get_questions': Topic,
+    'websites.gamefaqs.gameparser.get_question_details': QuestionDetails,
+    'websites.gamefaqs.gamesearcher.parse_search_results': SearchResult,
+    'websites.gamerankings.gamesearcher.parse_search_results': RankingResult,
+    'websites.gamerankings.reviewparser.get_rankings': Review}
+
+CONVERTERS = {
+    'websites.gamefaqs.gameparser.get_advanced_info': __advanced_info}
+
+
+def from_result(parser, result):
+    '''
+    Converts the result of a parsing function into records, if a record type is registered for the function.
+    Lists of dictionaries are converted into lists of records, other results are returned unchanged.
+
+    :param parser: Parsing function, which returned the result.
+    :param result: Result of the parsing function.
+    '''
+    name = f'{parser.__module__}.{parser.__name__}'
+
+    if name in CONVERTERS:
+        return CONVERTERS[name](result)
+
+    record = RECORDS.get(name)
+    if not record:
+        return result
+    if isinstance(result, list):
+        return [record.from_dict(item) for item in result]
+    return record.from_dict(result)
@@ -0,0 +1,303 @@
+'''
+This module contains a resolver matching games of gamefaqs to their entries on gamerankings
+and attaching the reviews of the matched entries.
+'''
+
+import difflib
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from helper import helper
+from websites.gamerankings.model import Gamerankings
+from websites import records
+
+
+# Normalized platform names of gamefaqs, which differ from those of gamerankings.
+PLATFORMS = {
+    'playstation': 'ps',
+    'ps1': 'ps',
+    'psx': 'ps',
+    'playstation2': 'ps2',
+    'playstation3': 'ps3',
+    'playstation4': 'ps4',
+    'playstation5': 'ps5',
+    'playstationvita': 'vita',
+    'psvita': 'vita',
+    'playstationportable': 'psp',
+    'xbox360': 'x360',
+    'xboxone': 'xone',
+    'nintendoswitch': 'switch',
+    'nintendo3ds': '3ds',
+    'nintendods': 'ds',
+    'nintendo64': 'n64',
+    'gamecube': 'gc',
+    'gameboyadvance': 'gba',
+    'macintosh': 'mac',
+    'windows': 'pc'}
+
+ROMAN_NUMERALS = {
+    'ii': '2', 'iii': '3', 'iv': '4', 'v': '5', 'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9', 'x': '10'}
+
+NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+YEAR = re.compile(r'\b(\d{4})\b')
+INDEX_PAGE = re.compile(r'/index\.html$')
+
+
+class BlockingIndex:
+    '''
+    Index of gamerankings search results, which restricts the comparison of a game to the candidates
+    on one of its platforms released in the same or an adjacent year, instead of comparing it to all candidates.
+    Candidates with an unknown year are kept in a block of their own, which is compared to every game on their
+    platform, as are all candidates on the platforms of a game with an unknown year.
+
+    Candidates with the same normalized title, platform and year are found by a single lookup.
+    '''
+    def __init__(self):
+        '''
+        Initializes a BlockingIndex instance.
+        '''
+        self.exact = dict()
+        self.blocks = defaultdict(dict)
+        self.years = defaultdict(set)
+
+    def add(self, result):
+        '''
+        Adds a gamerankings search result to the index. Search results already in the index are ignored.
+
+        :param result: Search result, as returned by Gamerankings.search_game.
+        '''
+        title = normalize_title(result['Name'])
+        platform = normalize_platform(result['Console'])
+        year = get_year(result['Year'])
+
+        self.exact.setdefault((title, platform, year), result)
+        self.blocks[(platform, year)].setdefault(result['Link'], (title, result))
+        if year:
+            self.years[platform].add(year)
+
+    def match(self, title, platforms, year):
+        '''
+        Returns the best matching search result and its confidence (0-1), or None and 0.0 if there is no candidate.
+
+        The confidence is the similarity of the normalized titles, reduced by 10% if the release years differ by one,
+        or by 20% if the year of one of them is unknown.
+
+        :param title: Normalized title of the game.
+        :param platforms: Normalized platforms of the game.
+        :param year: Release year of the game, None if unknown.
+        '''
+        for platform in platforms:
+            if year and (title, platform, year) in self.exact:
+                return self.exact[(title, platform, year)], 1.0
+
+        best, confidence = None, 0.0
+        for platform in platforms:
+            blocks = [(self.blocks.get((platform, None), dict()), 0.8)]
+            if year:
+                blocks += [
+                    (self.blocks.get((platform, year), dict()), 1.0),
+                    (self.blocks.get((platform, year - 1), dict()), 0.9),
+                    (self.blocks.get((platform, year + 1), dict()), 0.9)]
+            else:
+                blocks += [(self.blocks[(platform, known)], 0.8) for known in self.years.get(platform, ())]
+
+            for block, weight in blocks:
+                for candidate_title, result in block.values():
+                    similarity = weight * difflib.SequenceMatcher(None, title, candidate_title).ratio()
+                    if similarity > confidence:
+                        best, confidence = result, similarity
+
+        return best, confidence
+
+
+class ReviewResolver:
+    '''
+    Resolver matching games of gamefaqs, e.g. search results or full base info, to their entries on gamerankings
+    and retrieving the reviews of the matched entries.
+
+    Every distinct title is searched on gamerankings once, all searches and review pages are requested
+    concurrently by a pool of worker threads, each one using its own Gamerankings instance, while all of them
+    share one pooled transport. The search results are collected in a BlockingIndex, so that every game is only
+    compared to the entries on its platforms with a similar release year.
+    '''
+    def __init__(self, headers=None, transport=None, max_workers=8, parser=None, max_pages=1, min_confidence=0.75,
+                 metrics=None, index=None):
+        '''
+        Initializes a ReviewResolver instance.
+
+        :param headers: Requests headers, containing the key User-Agent.
+        :param transport: Pooled transport shared by all workers. If none is provided, the resolver creates one
+        with a connection pool large enough for all workers.
+        :param max_workers: Number of concurrent requests.
+        :param parser: BeautifulSoup backend (html.parser, lxml or html5lib), defaults to the process-wide default.
+        :param max_pages: Maximum number of search pages requested per title.
+        :param min_confidence: Minimum confidence (0-1) of a match. Games without a better match remain unmatched.
+        :param metrics: Optional Metrics of the metrics module, shared by all workers.
+        :param index: Optional SearchIndex of the searchindex module, answering the searches without requests.
+        '''
+        self.headers = headers
+        self.owns_transport = transport is None
+        self.transport = transport if transport else helper.Transport(pool_maxsize=max_workers * 2)
+        self.max_workers = max_workers
+        self.parser = parser
+        self.max_pages = max_pages
+        self.min_confidence = min_confidence
+        self.metrics = metrics
+        self.index = index
+        self.local = threading.local()
+
+    def resolve(self, games, reviews=True):
+        '''
+        Returns the games joined with their gamerankings entries, in the order of the given games.
+        The resolver can be used repeatedly until it is closed.
+
+        Every result is a dictionary with the keys Game, containing the given game, Match, containing the matched
+        gamerankings search result or None, Confidence, and Reviews, containing the reviews of the matched entry
+        if reviews are retrieved. If the search or the reviews of a game could not be retrieved, the dictionary
+        has the key Error as well.
+
+        :param games: Search results of GameFAQs.search_game, results of get_full_base_info, results of get_base_info
+        with the key Name added, or dictionaries with the keys Name, Platform and Year.
+        :param reviews: If true, the reviews of all matched entries are retrieved.
+        '''
+        games = [records.to_dict(game) for game in games]
+        keys = [get_key(game) for game in games]
+        blocking_index = BlockingIndex()
+        errors = dict()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            queries = dict()
+            for game, (title, _, _) in zip(games, keys):
+                queries.setdefault(title, game['Name'])
+
+            for title, future in [(title, executor.submit(self.__search, name)) for title, name in queries.items()]:
+                try:
+                    for result in future.result():
+                        blocking_index.add(result)
+                except Exception as error:
+                    errors[title] = str(error)
+
+            matches = [blocking_index.match(*key) for key in keys]
+            matches = [(match, confidence) if confidence >= self.min_confidence else (None, confidence)
+                       for match, confidence in matches]
+
+            links = dict.fromkeys(match['Link'] for match, _ in matches if match) if reviews else dict()
+            futures = {link: executor.submit(self.__get_reviews, link) for link in links}
+
+        results = list()
+        for game, (title, _, _), (match, confidence) in zip(games, keys, matches):
+            result = {
+                'Game': game,
+                'Match': match,
+                'Confidence': round(confidence, 3)}
+            if reviews:
+                result['Reviews'] = None
+                if match:
+                    try:
+                        result['Reviews'] = futures[match['Link']].result()
+                    except Exception as error:
+                        result['Error'] = str(error)
+            if title in errors:
+                result['Error'] = errors[title]
+            results.append(result)
+
+        return results
+
+    def close(self):
+        '''
+        Closes the transport, if it was created by this instance.
+        '''
+        if self.owns_transport:
+            self.transport.close()
+
+    def __gamerankings(self):
+        '''
+        Returns the Gamerankings instance of the current worker thread.
+        '''
+        if not hasattr(self.local, 'gamerankings'):
+            self.local.gamerankings = Gamerankings(
+                headers=self.headers, transport=self.transport, parser=self.parser, metrics=self.metrics,
+                profile=False, index=self.index)
+
+        return self.local.gamerankings
+
+    def __search(self, name):
+        '''
+        Returns all gamerankings search results for a name.
+        '''
+        return [result for page in self.__gamerankings().search_game(name, max_pages=self.max_pages) for result in page]
+
+    def __get_reviews(self, link):
+        '''
+        Returns the reviews of a gamerankings entry, given the link of its search result.
+        '''
+        gamerankings = self.__gamerankings()
+
+        try:
+            gamerankings.gamesession(INDEX_PAGE.sub('', link))
+            return gamerankings.get_reviews()
+        finally:
+            gamerankings.free_documents()
+
+
+def get_key(game):
+    '''
+    Returns the normalized title, the normalized platforms and the release year of a gamefaqs game.
+
+    :param game: Search result of GameFAQs.search_game, result of get_full_base_info, result of get_base_info
+    with the key Name added, or dictionary with the keys Name, Platform and Year.
+    '''
+    if 'Consoles' in game:
+        platforms = [console['Name'] for console in game['Consoles']]
+    else:
+        platforms = [game.get('Platform') or game.get('Core-Platform')]
+        also_on = game.get('Also-on')
+        platforms += [also_on] if isinstance(also_on, str) else also_on if also_on else []
+
+    return (
+        normalize_title(game['Name']),
+        list(dict.fromkeys(normalize_platform(platform) for platform in platforms if platform)),
+        get_year(game.get('Year', game.get('Release'))))
+
+
+def normalize_title(title):
+    '''
+    Returns a title in lowercase without diacritics, punctuation, a leading article and roman numerals,
+    e.g. tales of symphonia 2 for Tales of Symphonia II.
+
+    :param title: Title of a game.
+    '''
+    title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode('ascii').lower()
+    title = title.replace('&', ' and ').replace('\'', '')
+    words = [ROMAN_NUMERALS.get(word, word) for word in NON_ALPHANUMERIC.sub(' ', title).split()]
+    if len(words) > 1 and words[0] == 'the':
+        words = words[1:]
+
+    return ' '.join(words)
+
+
+def normalize_platform(platform):
+    '''
+    Returns the platform name shared by both websites, e.g. ps4 for PlayStation 4 or PS4.
+
+    :param platform: Platform name of gamefaqs or gamerankings.
+    '''
+    platform = NON_ALPHANUMERIC.sub('', platform.lower())
+
+    return PLATFORMS.get(platform, platform)
+
+
+def get_year(value):
+    '''
+    Returns the year of a year or release date, or None if it contains none, e.g. for cancelled games.
+
+    :param value: Year or release date as string or number.
+    '''
+    if isinstance(value, int):
+        return value
+
+    match = YEAR.search(str(value)) if value else None
+
+    return int(match.group(1)) if match else None
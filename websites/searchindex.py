@@ -0,0 +1,231 @@
+'''
+This module contains a persistent local search index over crawled games, which answers searches
+without requests to the websites.
+'''
+
+import json
+import re
+import sqlite3
+import threading
+from websites import records
+
+
+PAGE_SIZES = {
+    'gamefaqs': 20,
+    'gamerankings': 50}
+
+FUZZY_CANDIDATES = 200
+
+WORDS = re.compile(r'\w+')
+
+
+class SearchIndex:
+    '''
+    SQLite-backed search index over the games of one or more websites, built from the results of
+    GameFAQs.get_all_games and of the search_game methods of the website models.
+
+    Every game is indexed twice with SQLite's full-text search: by the tokens of its name and company, and by
+    the trigrams of its name. A search first looks for games containing all tokens of the query (the last token
+    may be a prefix), ranked by relevance. If there are none, games containing enough of the trigrams of the query
+    are returned, ranked by their similarity, so that misspelled queries are still answered. The database
+    is memory-mapped, so that opening even a large index does not read it completely.
+
+    An index can be passed to the website models, whose search_game methods then answer from the index
+    and only search on the website if the index does not contain a matching game.
+    '''
+    def __init__(self, path, min_similarity=0.5, mmap_size=256 * 1024 * 1024):
+        '''
+        Initializes a SearchIndex instance.
+
+        :param path: Path of the SQLite database file, or :memory: for an index which is not persisted.
+        :param min_similarity: Minimum share of the trigrams of the query contained in a game´s name (0-1)
+        for fuzzy matches.
+        :param mmap_size: Maximum number of bytes of the database file memory-mapped.
+        '''
+        self.min_similarity = min_similarity
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(f'PRAGMA mmap_size = {int(mmap_size)}')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS games ('
+            'id INTEGER PRIMARY KEY, site TEXT, link TEXT, name TEXT, company TEXT, result TEXT, UNIQUE (site, link))')
+        self.connection.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS tokens USING fts5('
+            'name, company, tokenize = \'unicode61 remove_diacritics 2\')')
+        self.connection.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS trigrams USING fts5(name, tokenize = \'trigram\')')
+        self.connection.commit()
+
+    def add_games(self, games, console, site='gamefaqs'):
+        '''
+        Adds the games of a console catalog. Games already in the index, e.g. from search results,
+        are not replaced, as search results contain more information.
+
+        :param games: Games as returned by GameFAQs.get_all_games or iter_all_games.
+        :param console: Console of the catalog, e.g. ps4.
+        :param site: Name of the website of the games.
+        '''
+        self.__add(({
+            'Name': game['Name'],
+            'Link': game['Link'],
+            'Genre': None,
+            'Company': None,
+            'Year': None,
+            'Consoles': [{
+                'Name': console,
+                'Link': game['Link']}]} for game in records.to_dict(games)), site, False)
+
+    def add_search_results(self, results, site='gamefaqs'):
+        '''
+        Adds search results, replacing games with the same link already in the index.
+
+        :param results: Search results, as yielded by the search_game method of the website model.
+        :param site: Name of the website of the search results.
+        '''
+        self.__add(records.to_dict(results), site, True)
+
+    def search(self, game, limit=None, site='gamefaqs'):
+        '''
+        Returns the games matching a search string, best matches first, in the format of the search results
+        of the website. Games added from a catalog only have a name, a link and their console.
+
+        :param game: Search string.
+        :param limit: Maximum number of returned games. If None, all matching games are returned.
+        :param site: Name of the website, whose games are searched.
+        '''
+        words = [word.lower() for word in WORDS.findall(game)]
+        if not words:
+            return list()
+
+        query = ' '.join(quote(word) for word in words[:-1]) + f' {quote(words[-1])}*'
+        limit = limit if limit else -1
+
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT games.result FROM tokens JOIN games ON games.id = tokens.rowid '
+                'WHERE tokens MATCH ? AND games.site = ? ORDER BY bm25(tokens, 10.0, 1.0) LIMIT ?',
+                (query, site, limit)).fetchall()
+
+            if not rows:
+                rows = self.__fuzzy_search(game, limit, site)
+
+        return [json.loads(row[0]) for row in rows]
+
+    def search_pages(self, game, max_pages=1, site='gamefaqs'):
+        '''
+        Returns the games matching a search string split into pages of the size of the website´s search pages,
+        or an empty list if no game matches.
+
+        :param game: Search string.
+        :param max_pages: Maximum number of pages.
+        :param site: Name of the website, whose games are searched.
+        '''
+        size = PAGE_SIZES.get(site, 20)
+        results = self.search(game, size * max_pages, site)
+
+        return [results[start:start + size] for start in range(0, len(results), size)]
+
+    def search_game(self, game, max_pages=1, site='gamefaqs'):
+        '''
+        Returns a generator with the pages of games matching a search string, like the search_game methods
+        of the website models.
+
+        :param game: Search string.
+        :param max_pages: Maximum number of pages.
+        :param site: Name of the website, whose games are searched.
+        '''
+        yield from self.search_pages(game, max_pages, site)
+
+    def count(self, site=None):
+        '''
+        Returns the number of indexed games, optionally restricted to a single website.
+
+        :param site: Name of the website.
+        '''
+        with self.lock:
+            if site:
+                return self.connection.execute('SELECT COUNT(*) FROM games WHERE site = ?', (site,)).fetchone()[0]
+            return self.connection.execute('SELECT COUNT(*) FROM games').fetchone()[0]
+
+    def close(self):
+        '''
+        Closes the database connection.
+        '''
+        with self.lock:
+            self.connection.close()
+
+    def __fuzzy_search(self, game, limit, site):
+        '''
+        Returns the rows of the games containing at least the minimum share of the trigrams of the search string,
+        most similar first. The lock must be held.
+        '''
+        query_trigrams = get_trigrams(game)
+        inner_trigrams = [trigram for trigram in query_trigrams if ' ' not in trigram]
+        if not inner_trigrams:
+            return list()
+
+        candidates = self.connection.execute(
+            'SELECT games.name, games.result FROM trigrams JOIN games ON games.id = trigrams.rowid '
+            'WHERE trigrams MATCH ? AND games.site = ? ORDER BY rank LIMIT ?',
+            (' OR '.join(quote(trigram) for trigram in inner_trigrams), site, FUZZY_CANDIDATES)).fetchall()
+
+        ranked = list()
+        for name, result in candidates:
+            trigrams = get_trigrams(name)
+            common = len(query_trigrams & trigrams)
+            similarity = common / len(query_trigrams)
+            if similarity >= self.min_similarity:
+                ranked.append((similarity, common / len(query_trigrams | trigrams), result))
+
+        ranked.sort(key=lambda candidate: candidate[:2], reverse=True)
+        return [(result,) for _, _, result in (ranked if limit < 0 else ranked[:limit])]
+
+    def __add(self, results, site, replace):
+        '''
+        Adds results to the index, optionally replacing games with the same link.
+        '''
+        with self.lock:
+            for result in results:
+                row = self.connection.execute(
+                    'SELECT id FROM games WHERE site = ? AND link = ?', (site, result['Link'])).fetchone()
+                if row:
+                    if not replace:
+                        continue
+                    self.connection.execute('DELETE FROM games WHERE id = ?', row)
+                    self.connection.execute('DELETE FROM tokens WHERE rowid = ?', row)
+                    self.connection.execute('DELETE FROM trigrams WHERE rowid = ?', row)
+
+                company = result.get('Company') or ''
+                rowid = self.connection.execute(
+                    'INSERT INTO games (site, link, name, company, result) VALUES (?, ?, ?, ?, ?)',
+                    (site, result['Link'], result['Name'], company, json.dumps(result, ensure_ascii=False))).lastrowid
+                self.connection.execute(
+                    'INSERT INTO tokens (rowid, name, company) VALUES (?, ?, ?)', (rowid, result['Name'], company))
+                self.connection.execute('INSERT INTO trigrams (rowid, name) VALUES (?, ?)', (rowid, result['Name']))
+
+            self.connection.commit()
+
+
+def get_trigrams(text):
+    '''
+    Returns the set of trigrams of the lowercase words of a text. Every word is padded with two leading spaces
+    and a trailing one, so that the trigrams also capture the start and end of the words,
+    e.g. {'  s', ' sp', 'spa', 'pam', 'am '} for Spam.
+
+    :param text: Text to be split into trigrams.
+    '''
+    trigrams = set()
+    for word in WORDS.findall(text.lower()):
+        word = f'  {word} '
+        trigrams.update(word[index:index + 3] for index in range(len(word) - 2))
+
+    return trigrams
+
+
+def quote(text):
+    '''
+    Returns a text as quoted string of the full-text search query syntax.
+
+    :param text: Text to be quoted.
+    '''
+    return '"' + text.replace('"', '""') + '"'